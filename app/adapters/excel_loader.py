@@ -150,6 +150,10 @@ class ExcelLoader:
         :param df: Загруженный DataFrame
         :param file_description: Описание файла
         """
+        # isnull() и memory_usage(deep=True) проходят по всем данным - в PROD режиме не считаем
+        if not self.pipeline_logger.is_detail_enabled:
+            return
+        
         self.pipeline_logger.log_detail(f"Успешно загружен {file_description}")
         self.pipeline_logger.log_detail(f"Количество строк: {len(df)}")
         self.pipeline_logger.log_detail(f"Количество колонок: {len(df.columns)}")
@@ -0,0 +1,133 @@
+# app/adapters/llm_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+from app.utils.logging import setup_logger
+
+# Настройка логгера
+logger = setup_logger(__name__)
+
+
+class LLMResponseCache:
+    """
+    Кэш ответов LLM с точным совпадением входных данных.
+    Хранит последние ответы в памяти и вытесняет самые старые (LRU).
+    """
+
+    def __init__(self, max_size: int = 4096):
+        """
+        Инициализация кэша.
+
+        :param max_size: Максимальное количество хранимых ответов
+        """
+        self.max_size = max_size
+        self._storage: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()  # Кэш может использоваться из нескольких потоков
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Строит стабильный ключ кэша по частям запроса.
+
+        :param parts: Части запроса (промпты, модель, температура и т.д.)
+        :return: Хеш ключа в виде hex-строки
+        """
+        hasher = hashlib.blake2b(digest_size=32)
+        for part in parts:
+            hasher.update(str(part).encode("utf-8"))
+            hasher.update(b"\x00")  # Разделитель, чтобы ("ab", "c") != ("a", "bc")
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Возвращает закэшированный ответ и помечает его как недавно использованный.
+
+        :param key: Ключ кэша
+        :return: Закэшированное значение или None
+        """
+        with self._lock:
+            if key not in self._storage:
+                self.misses += 1
+                return None
+            self._storage.move_to_end(key)
+            self.hits += 1
+            return self._storage[key]
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Сохраняет ответ в кэше, вытесняя самый старый при переполнении.
+
+        :param key: Ключ кэша
+        :param value: Значение для сохранения
+        """
+        with self._lock:
+            self._storage[key] = value
+            self._storage.move_to_end(key)
+            if len(self._storage) > self.max_size:
+                self._storage.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._storage.clear()
+
+
+class PersistentLLMCache:
+    """
+    Постоянный кэш детерминированных ответов LLM (temperature=0) в SQLite.
+    Переживает перезапуск приложения; значения хранятся как текст (строка или JSON модели).
+    """
+
+    def __init__(self, directory: str):
+        """
+        Инициализация кэша.
+
+        :param directory: Каталог для файла кэша
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        logger.info(f"Постоянный кэш ответов LLM: {self.path}")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Возвращает сохраненный ответ.
+
+        :param key: Ключ кэша
+        :return: Сохраненное значение или None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Сохраняет ответ.
+
+        :param key: Ключ кэша
+        :param value: Текст ответа или JSON модели
+        """
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
@@ -1,9 +1,12 @@
 # app/adapters/llm_client.py
 
-from openai import OpenAI
-from typing import Dict, List, Any, Optional, Type, TypeVar
-from pydantic import BaseModel
+import httpx
+from functools import lru_cache
+from openai import OpenAI, AsyncOpenAI
+from typing import Dict, Iterator, List, Any, Optional, Type, TypeVar
+from pydantic import BaseModel, TypeAdapter
 from app.config import llm_settings
+from app.adapters.llm_cache import LLMResponseCache, PersistentLLMCache
 from app.utils.logging import setup_logger
 
 # Настройка логгера
@@ -11,31 +14,154 @@ logger = setup_logger(__name__)
 
 T = TypeVar('T', bound=BaseModel)
 
+
+@lru_cache(maxsize=128)
+def get_type_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    Возвращает TypeAdapter для модели ответа.
+    Создается один раз на класс модели и переиспользуется для валидации и JSON-схемы.
+    
+    :param model: Класс модели Pydantic
+    :return: TypeAdapter для модели
+    """
+    return TypeAdapter(model)
+
+
 class LLMClient:
     """Клиент для взаимодействия с моделями LLM."""
     
     def __init__(self):
         """Инициализация клиента LLM."""
+        # Кэш ответов: повторный запрос с теми же промптами не уходит в LLM
+        self.cache = LLMResponseCache(llm_settings.cache_max_size) if llm_settings.cache_enabled else None
+        # Ответы с temperature=0 детерминированы - их сохраняем на диск, чтобы пережить перезапуск
+        self.deterministic_cache: Optional[PersistentLLMCache] = None
+        if llm_settings.cache_enabled and llm_settings.deterministic_cache_enabled:
+            try:
+                self.deterministic_cache = PersistentLLMCache(llm_settings.deterministic_cache_dir)
+            except Exception as e:
+                logger.warning(f"Постоянный кэш ответов LLM недоступен: {e}")
+        
         try:
             self.base_url = llm_settings.ollama_base_url
             self.api_key = llm_settings.ollama_api_key
             self.model_name = llm_settings.ollama_model
             
+            # Общий пул соединений на весь процесс (LLMClient - singleton в контейнере):
+            # классификация и генерация ответов переиспользуют keep-alive соединения
+            limits = httpx.Limits(
+                max_connections=llm_settings.max_connections,
+                max_keepalive_connections=llm_settings.max_keepalive_connections
+            )
             self.client = OpenAI(
                 base_url=self.base_url,
-                api_key=self.api_key
+                api_key=self.api_key,
+                http_client=httpx.Client(limits=limits)
+            )
+            # Асинхронный клиент для параллельной отправки независимых запросов
+            self.async_client = AsyncOpenAI(
+                base_url=self.base_url,
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(limits=limits)
             )
             
             logger.info(f"Инициализирован LLM клиент с моделью {self.model_name}")
         except Exception as e:
             logger.error(f"Ошибка инициализации LLM клиента: {e}")
             self.client = None
+            self.async_client = None
+    
+    def _cache_key(self, system_prompt: str, user_prompt: str, temperature: float, *extra: str) -> str:
+        """
+        Строит ключ кэша по всем параметрам, влияющим на ответ модели.
+        
+        :param system_prompt: Системный промпт
+        :param user_prompt: Пользовательский промпт
+        :param temperature: Температура
+        :param extra: Дополнительные части ключа (например, имя модели ответа)
+        :return: Ключ кэша
+        """
+        return LLMResponseCache.make_key(self.model_name, temperature, system_prompt, user_prompt, *extra)
+    
+    def _get_cached(
+        self,
+        cache_key: str,
+        bypass_cache: bool,
+        temperature: float,
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> Optional[Any]:
+        """
+        Возвращает ответ из кэша, если кэш включен и не обходится.
+        Сначала проверяется кэш в памяти, затем (для temperature=0) постоянный кэш.
+        
+        :param cache_key: Ключ кэша
+        :param bypass_cache: Флаг обхода кэша
+        :param temperature: Температура запроса
+        :param response_model: Модель структурированного ответа (для восстановления из JSON)
+        :return: Закэшированный ответ или None
+        """
+        if self.cache is None or bypass_cache:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Ответ LLM взят из кэша")
+            return cached
+        
+        if self.deterministic_cache is None or temperature != 0:
+            return None
+        blob = self.deterministic_cache.get(cache_key)
+        if blob is None:
+            return None
+        
+        try:
+            cached = get_type_adapter(response_model).validate_json(blob) if response_model else blob
+        except Exception as e:
+            # Схема модели изменилась - сохраненный ответ больше не подходит
+            logger.debug(f"Ответ из постоянного кэша не прошел валидацию: {e}")
+            return None
+        logger.debug("Ответ LLM взят из постоянного кэша")
+        self.cache.set(cache_key, cached)
+        return cached
+    
+    def _set_cached(self, cache_key: str, value: Any, bypass_cache: bool, temperature: float) -> None:
+        """
+        Сохраняет ответ в кэш, если кэш включен и не обходится.
+        
+        :param cache_key: Ключ кэша
+        :param value: Ответ модели
+        :param bypass_cache: Флаг обхода кэша
+        :param temperature: Температура запроса
+        """
+        if self.cache is None or bypass_cache or not value:
+            return
+        self.cache.set(cache_key, value)
+        
+        if self.deterministic_cache is not None and temperature == 0:
+            try:
+                blob = value.model_dump_json() if isinstance(value, BaseModel) else value
+                self.deterministic_cache.set(cache_key, blob)
+            except Exception as e:
+                logger.warning(f"Не удалось сохранить ответ в постоянный кэш: {e}")
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Возвращает счетчики попаданий в кэши ответов.
+        
+        :return: Словарь со счетчиками
+        """
+        stats = {}
+        if self.cache is not None:
+            stats.update(memory_hits=self.cache.hits, memory_misses=self.cache.misses)
+        if self.deterministic_cache is not None:
+            stats.update(deterministic_hits=self.deterministic_cache.hits, deterministic_misses=self.deterministic_cache.misses)
+        return stats
     
     def generate_completion(
         self,
         system_prompt: str,
         user_prompt: str,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        bypass_cache: bool = False
     ) -> str:
         """
         Генерирует текстовый ответ от LLM.
@@ -43,11 +169,17 @@ class LLMClient:
         :param system_prompt: Системный промпт
         :param user_prompt: Пользовательский промпт
         :param temperature: Температура (степень креативности)
+        :param bypass_cache: Не использовать кэш ответов (например, для тестов)
         :return: Текстовый ответ от модели
         """
         if not self.client:
             logger.error("LLM клиент не инициализирован")
             return ""
+        
+        cache_key = self._cache_key(system_prompt, user_prompt, temperature)
+        cached = self._get_cached(cache_key, bypass_cache, temperature)
+        if cached is not None:
+            return cached
             
         try:
             completion = self.client.chat.completions.create(
@@ -62,17 +194,70 @@ class LLMClient:
             response_text = completion.choices[0].message.content
             logger.debug(f"Получен ответ от LLM: {response_text[:100]}...")
             
+            self._set_cached(cache_key, response_text, bypass_cache, temperature)
             return response_text
         except Exception as e:
             logger.error(f"Ошибка при генерации ответа от LLM: {e}")
             return ""
     
+    def generate_completion_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.0,
+        bypass_cache: bool = False
+    ) -> Iterator[str]:
+        """
+        Генерирует текстовый ответ от LLM по частям, по мере их поступления от модели.
+        Полный ответ после завершения потока сохраняется в кэш, как в generate_completion.
+        
+        :param system_prompt: Системный промпт
+        :param user_prompt: Пользовательский промпт
+        :param temperature: Температура (степень креативности)
+        :param bypass_cache: Не использовать кэш ответов (например, для тестов)
+        :return: Итератор фрагментов текста ответа
+        """
+        if not self.client:
+            raise RuntimeError("LLM клиент не инициализирован")
+        
+        cache_key = self._cache_key(system_prompt, user_prompt, temperature)
+        cached = self._get_cached(cache_key, bypass_cache, temperature)
+        if cached is not None:
+            yield cached
+            return
+        
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+                stream=True,
+            )
+            
+            parts = []
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    parts.append(content)
+                    yield content
+            
+            self._set_cached(cache_key, "".join(parts), bypass_cache, temperature)
+        except Exception as e:
+            logger.error(f"Ошибка при потоковой генерации ответа от LLM: {e}")
+            raise
+    
     def generate_structured_completion(
         self,
         system_prompt: str,
         user_prompt: str,
         response_model: Type[T],
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        bypass_cache: bool = False
     ) -> Optional[T]:
         """
         Генерирует структурированный ответ от LLM.
@@ -81,11 +266,17 @@ class LLMClient:
         :param user_prompt: Пользовательский промпт
         :param response_model: Модель данных Pydantic для ответа
         :param temperature: Температура (степень креативности)
+        :param bypass_cache: Не использовать кэш ответов (например, для тестов)
         :return: Структурированный ответ в виде модели Pydantic или None при ошибке
         """
         if not self.client:
             logger.error("LLM клиент не инициализирован")
             return None
+        
+        cache_key = self._cache_key(system_prompt, user_prompt, temperature, response_model.__name__)
+        cached = self._get_cached(cache_key, bypass_cache, temperature, response_model)
+        if cached is not None:
+            return cached
             
         try:
             completion = self.client.beta.chat.completions.parse(
@@ -101,6 +292,7 @@ class LLMClient:
             response = completion.choices[0].message
             if response.parsed:
                 logger.debug("Получен структурированный ответ от LLM")
+                self._set_cached(cache_key, response.parsed, bypass_cache, temperature)
                 return response.parsed
             
             logger.warning("Модель не вернула структурированный ответ")
@@ -110,6 +302,102 @@ class LLMClient:
             logger.error(f"Ошибка при получении структурированного ответа от LLM: {e}")
             return None
     
+    async def agenerate_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.0,
+        bypass_cache: bool = False
+    ) -> str:
+        """
+        Асинхронно генерирует текстовый ответ от LLM.
+        Позволяет отправлять несколько запросов одновременно через asyncio.gather.
+        
+        :param system_prompt: Системный промпт
+        :param user_prompt: Пользовательский промпт
+        :param temperature: Температура (степень креативности)
+        :param bypass_cache: Не использовать кэш ответов (например, для тестов)
+        :return: Текстовый ответ от модели
+        """
+        if not self.async_client:
+            logger.error("Асинхронный LLM клиент не инициализирован")
+            return ""
+        
+        cache_key = self._cache_key(system_prompt, user_prompt, temperature)
+        cached = self._get_cached(cache_key, bypass_cache, temperature)
+        if cached is not None:
+            return cached
+            
+        try:
+            completion = await self.async_client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+            )
+            
+            response_text = completion.choices[0].message.content
+            logger.debug(f"Получен асинхронный ответ от LLM: {response_text[:100]}...")
+            
+            self._set_cached(cache_key, response_text, bypass_cache, temperature)
+            return response_text
+        except Exception as e:
+            logger.error(f"Ошибка при асинхронной генерации ответа от LLM: {e}")
+            return ""
+    
+    async def agenerate_structured_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_model: Type[T],
+        temperature: float = 0.0,
+        bypass_cache: bool = False
+    ) -> Optional[T]:
+        """
+        Асинхронно генерирует структурированный ответ от LLM.
+        
+        :param system_prompt: Системный промпт
+        :param user_prompt: Пользовательский промпт
+        :param response_model: Модель данных Pydantic для ответа
+        :param temperature: Температура (степень креативности)
+        :param bypass_cache: Не использовать кэш ответов (например, для тестов)
+        :return: Структурированный ответ в виде модели Pydantic или None при ошибке
+        """
+        if not self.async_client:
+            logger.error("Асинхронный LLM клиент не инициализирован")
+            return None
+        
+        cache_key = self._cache_key(system_prompt, user_prompt, temperature, response_model.__name__)
+        cached = self._get_cached(cache_key, bypass_cache, temperature, response_model)
+        if cached is not None:
+            return cached
+            
+        try:
+            completion = await self.async_client.beta.chat.completions.parse(
+                temperature=temperature,
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format=response_model,
+            )
+            
+            response = completion.choices[0].message
+            if response.parsed:
+                logger.debug("Получен асинхронный структурированный ответ от LLM")
+                self._set_cached(cache_key, response.parsed, bypass_cache, temperature)
+                return response.parsed
+            
+            logger.warning("Модель не вернула структурированный ответ")
+            return None
+                
+        except Exception as e:
+            logger.error(f"Ошибка при асинхронном получении структурированного ответа от LLM: {e}")
+            return None
+    
     def chat_completion_with_tools(
         self,
         system_prompt: str,
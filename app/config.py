@@ -2,7 +2,7 @@
 
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
-from typing import Dict, Type, Optional, Any, List
+from typing import Dict, Type, Optional, Any, List, Literal
 from enum import Enum
 
 class BaseAppSettings(BaseSettings):
@@ -77,10 +77,53 @@ class LLMSettings(BaseAppSettings):
     ollama_base_url: str
     ollama_api_key: str
     ollama_model: str
+    
+    # Кэш ответов LLM (точное совпадение промптов)
+    cache_enabled: bool = True
+    cache_max_size: int = 4096
+    # Постоянный кэш детерминированных ответов (temperature=0)
+    deterministic_cache_enabled: bool = True
+    deterministic_cache_dir: str = ".cache/llm_det"
+    # Пул HTTP-соединений к LLM (общий для всех сервисов)
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+
+class ClassificationCacheSettings(BaseAppSettings):
+    """Настройки кэша результатов классификации."""
+    model_config = ConfigDict(
+        env_file='.env',
+        extra='allow',
+        env_prefix='CLASSIFICATION_CACHE_'
+    )
+    
+    enabled: bool = True
+    max_size: int = 512
+    # Семантический уровень: похожие по смыслу вопросы получают тот же результат
+    semantic_enabled: bool = False
+    semantic_threshold: float = 0.92
+    # Время жизни результата в секундах (0 - без ограничения). Результаты хранятся отдельно для каждого
+    # списка элементов и при его перезагрузке не сбрасываются - вытесняются только по TTL/LRU
+    ttl_seconds: float = 3600
+
+class KeyBERTSettings(BaseAppSettings):
+    """Настройки модели KeyBERT."""
+    model_config = ConfigDict(
+        env_file='.env',
+        extra='allow',
+        env_prefix='KEYBERT_'
+    )
+    
+    model_name: str = "BAAI/bge-m3"
+    # Сжатие весов модели: "auto" - FP16 на GPU и динамическое int8-квантование на CPU, "none" - FP32
+    quantization: Literal["auto", "none"] = "auto"
+    # Сколько эмбеддингов слов-кандидатов держать в памяти между запросами
+    word_embedding_cache_size: int = 10000
 
 # Создание экземпляров настроек
 app_settings = AppSettings()
 llm_settings = LLMSettings()
+classification_cache_settings = ClassificationCacheSettings()
+keybert_settings = KeyBERTSettings()
 contractor_settings = ContractorSettings()
 risk_settings = RiskSettings()
 error_settings = ErrorSettings()
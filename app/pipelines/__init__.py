@@ -1,5 +1,6 @@
 # app/pipelines/__init__.py
 
+import pandas as pd
 from typing import Dict, Type
 from app.domain.enums import ButtonType, RiskCategory
 from app.pipelines.base import Pipeline
@@ -42,6 +43,9 @@ def init_container():
     Инициализирует контейнер с зависимостями.
     Регистрирует фабрики для создания сервисов.
     """
+    # Copy-on-Write: срезы DataFrame не копируются, пока их не изменят
+    pd.set_option("mode.copy_on_write", True)
+    
     # Регистрируем фабрики для адаптеров
     container.register_factory(ExcelLoader, lambda: ExcelLoader())
     container.register_factory(LLMClient, lambda: LLMClient())
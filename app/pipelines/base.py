@@ -2,7 +2,7 @@
 
 import pandas as pd
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Type
+from typing import Any, List, Dict, Optional, Type
 from pydantic import BaseModel
 from app.domain.models.answer import Answer
 from app.domain.enums import ButtonType
@@ -63,12 +63,12 @@ class BasePipeline(Pipeline):
         self.pipeline_logger.log_detail(f"Инициализирован {self.__class__.__name__}")
     
     @abstractmethod
-    def _create_model_instance(self, row: pd.Series, relevance_score: Optional[float]) -> BaseModel:
+    def _create_model_instance(self, row: Dict[str, Any], relevance_score: Optional[float]) -> BaseModel:
         """
         Создает экземпляр модели из строки DataFrame.
         Должен быть реализован в наследниках.
         
-        :param row: Строка DataFrame
+        :param row: Строка DataFrame в виде словаря {колонка: значение}
         :param relevance_score: Оценка релевантности
         :return: Экземпляр модели (Contractor, Risk, Error, Process)
         """
@@ -223,7 +223,8 @@ class BasePipeline(Pipeline):
                     6, "Фильтрация данных",
                     f"Найдено {len(filtered_df)} подходящих записей"
                 )
-                self.pipeline_logger.log_detail(f"Индексы отфильтрованных записей: {list(filtered_df.index)}")
+                if self.pipeline_logger.is_detail_enabled:
+                    self.pipeline_logger.log_detail(f"Индексы отфильтрованных записей: {list(filtered_df.index)}")
                 
             except Exception as e:
                 self.pipeline_logger.log_step_error(6, "Фильтрация данных", str(e))
@@ -365,8 +366,9 @@ class BasePipeline(Pipeline):
         entity_name = self._get_entity_name()
         self.pipeline_logger.log_detail(f"Преобразование {len(df)} записей в модели {entity_name}")
         
+        # to_dict('records') отдает строки простыми словарями без создания Series на каждую строку
         items = []
-        for idx, row in df.iterrows():
+        for idx, row in zip(df.index.tolist(), df.to_dict('records')):
             try:
                 item = self._create_model_instance(row, relevance_scores.get(idx))
                 items.append(item)
@@ -1,6 +1,6 @@
 # app/pipelines/contractors_pipeline.py
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import pandas as pd
 from app.pipelines.base import BasePipeline
 from app.domain.models.contractor import Contractor
@@ -40,11 +40,11 @@ class ContractorsPipeline(BasePipeline):
             tool_executor=tool_executor # Передаем в родительский класс
         )
     
-    def _create_model_instance(self, row: pd.Series, relevance_score: Optional[float]) -> Contractor:
+    def _create_model_instance(self, row: Dict[str, Any], relevance_score: Optional[float]) -> Contractor:
         """
         Создает экземпляр подрядчика из строки DataFrame.
         
-        :param row: Строка DataFrame
+        :param row: Строка DataFrame в виде словаря {колонка: значение}
         :param relevance_score: Оценка релевантности
         :return: Экземпляр Contractor
         """
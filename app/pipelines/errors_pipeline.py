@@ -1,6 +1,6 @@
 # app/pipelines/errors_pipeline.py
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import pandas as pd
 from app.pipelines.base import BasePipeline
 from app.domain.models.error import Error
@@ -40,11 +40,11 @@ class ErrorsPipeline(BasePipeline):
             tool_executor=tool_executor
         )
     
-    def _create_model_instance(self, row: pd.Series, relevance_score: Optional[float]) -> Error:
+    def _create_model_instance(self, row: Dict[str, Any], relevance_score: Optional[float]) -> Error:
         """
         Создает экземпляр ошибки из строки DataFrame.
         
-        :param row: Строка DataFrame
+        :param row: Строка DataFrame в виде словаря {колонка: значение}
         :param relevance_score: Оценка релевантности
         :return: Экземпляр Error
         """
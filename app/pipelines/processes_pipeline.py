@@ -1,6 +1,6 @@
 # app/pipelines/processes_pipeline.py
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import pandas as pd
 from app.pipelines.base import BasePipeline
 from app.domain.models.process import Process
@@ -40,11 +40,11 @@ class ProcessesPipeline(BasePipeline):
             tool_executor=tool_executor
         )
     
-    def _create_model_instance(self, row: pd.Series, relevance_score: Optional[float]) -> Process:
+    def _create_model_instance(self, row: Dict[str, Any], relevance_score: Optional[float]) -> Process:
         """
         Создает экземпляр процесса из строки DataFrame.
         
-        :param row: Строка DataFrame
+        :param row: Строка DataFrame в виде словаря {колонка: значение}
         :param relevance_score: Оценка релевантности
         :return: Экземпляр Process
         """
@@ -1,6 +1,6 @@
 # app/pipelines/risks_pipeline.py
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import pandas as pd
 from app.pipelines.base import BasePipeline
 from app.domain.models.risk import Risk
@@ -42,7 +42,7 @@ class RisksPipeline(BasePipeline):
             tool_executor=tool_executor
         )
     
-    def _create_model_instance(self, row: pd.Series, relevance_score: Optional[float]) -> Risk:
+    def _create_model_instance(self, row: Dict[str, Any], relevance_score: Optional[float]) -> Risk:
         """
         Создает экземпляр риска из строки DataFrame.
         """
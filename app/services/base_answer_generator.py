@@ -1,11 +1,12 @@
 # app/services/base_answer_generator.py
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Iterator, Optional
 from abc import ABC, abstractmethod
 from pydantic import BaseModel
 from app.adapters.llm_client import LLMClient
 from app.domain.models.answer import Answer
-from app.utils.logging import setup_logger, get_pipeline_logger
+from app.utils.logging import setup_logger, get_shared_pipeline_logger
 
 # Настройка логгера
 logger = setup_logger(__name__)
@@ -24,7 +25,7 @@ class BaseAnswerGeneratorService(ABC):
         :param llm_client: Клиент для взаимодействия с LLM
         """
         self.llm_client = llm_client
-        self.pipeline_logger = get_pipeline_logger(f"{self.__class__.__name__}")
+        self.pipeline_logger = get_shared_pipeline_logger(self.__class__.__name__)
         logger.info(f"Инициализирован {self.__class__.__name__}")
     
     @abstractmethod
@@ -64,6 +65,17 @@ class BaseAnswerGeneratorService(ABC):
         """
         pass
     
+    def _empty_response_text(self, question: str, **kwargs) -> str:
+        """
+        Возвращает готовый текст ответа для случая, когда элементы не найдены.
+        Может быть переопределен в наследниках.
+        
+        :param question: Вопрос пользователя
+        :param kwargs: Дополнительные параметры
+        :return: Текст ответа без обращения к LLM
+        """
+        return "По вашему запросу ничего не найдено."
+    
     def make_md(self, question: str, items: List[BaseModel], additional_context: str = "", **kwargs) -> Answer:
         """
         Генерирует markdown-ответ на основе вопроса и данных.
@@ -75,18 +87,194 @@ class BaseAnswerGeneratorService(ABC):
         :return: Модель Answer с сгенерированным ответом
         """
         self.pipeline_logger.log_detail(f"Начинаем генерацию ответа на вопрос: '{question}'")
+        
+        # Без элементов LLM нечего анализировать - отвечаем сразу, экономя полный вызов модели
+        if not items:
+            return self._build_empty_answer(question, **kwargs)
+        
+        prompts = self._prepare_answer_prompts(question, items, additional_context, kwargs)
+        
+        try:
+            # Генерируем ответ с помощью LLM
+            self.pipeline_logger.log_detail("Отправляем запрос к LLM для генерации ответа")
+            generated_text = self.llm_client.generate_completion(
+                system_prompt=prompts['system'],
+                user_prompt=prompts['user'],
+                temperature=0.2  # Немного креативности для более человечного ответа
+            )
+            return self._build_generated_answer(question, items, generated_text, **kwargs)
+            
+        except Exception as e:
+            return self._build_fallback_answer(question, items, e, **kwargs)
+    
+    def make_md_stream(self, question: str, items: List[BaseModel], additional_context: str = "", **kwargs) -> Iterator[str]:
+        """
+        Потоковая версия make_md: отдает фрагменты текста ответа по мере генерации,
+        не дожидаясь полного ответа LLM. Если генерация не началась, отдается fallback текст.
+        
+        :param question: Вопрос пользователя
+        :param items: Список элементов (Contractor, Risk, Error, Process)
+        :param additional_context: Дополнительный контекст для генерации ответа
+        :param kwargs: Дополнительные параметры специфичные для типа данных
+        :return: Итератор фрагментов markdown-ответа
+        """
+        self.pipeline_logger.log_detail(f"Начинаем потоковую генерацию ответа на вопрос: '{question}'")
+        
+        if not items:
+            yield self._empty_response_text(question, **kwargs)
+            return
+        
+        prompts = self._prepare_answer_prompts(question, items, additional_context, kwargs)
+        
+        parts = []
+        try:
+            self.pipeline_logger.log_detail("Отправляем потоковый запрос к LLM для генерации ответа")
+            for chunk in self.llm_client.generate_completion_stream(
+                system_prompt=prompts['system'],
+                user_prompt=prompts['user'],
+                temperature=0.2
+            ):
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            self.pipeline_logger.log_detail(f"Ошибка при потоковой генерации ответа: {e}", "ERROR")
+            if not parts:
+                # Клиент еще ничего не получил - можно отдать fallback целиком
+                yield self._generate_fallback_text(question, items, **kwargs)
+            return
+        
+        self.pipeline_logger.log_response("answer_generation", "".join(parts))
+    
+    def make_answer_stream(
+        self,
+        question: str,
+        items: List[BaseModel],
+        additional_context: str = "",
+        update_every: int = 8,
+        **kwargs
+    ) -> Iterator[Answer]:
+        """
+        Потоковая генерация, отдающая промежуточные модели Answer с накопленным текстом.
+        Промежуточный ответ отдается каждые update_every фрагментов, последний содержит полный текст.
+        
+        :param question: Вопрос пользователя
+        :param items: Список элементов (Contractor, Risk, Error, Process)
+        :param additional_context: Дополнительный контекст для генерации ответа
+        :param update_every: Через сколько фрагментов LLM отдавать очередной промежуточный ответ
+        :param kwargs: Дополнительные параметры специфичные для типа данных
+        :return: Итератор моделей Answer
+        """
+        parts = []
+        pending = 0
+        for chunk in self.make_md_stream(question, items, additional_context, **kwargs):
+            parts.append(chunk)
+            pending += 1
+            if pending >= update_every:
+                pending = 0
+                yield self._build_answer(question, items, "".join(parts), **kwargs)
+        
+        # Финальный ответ с полным текстом, если последние фрагменты еще не были отданы
+        if pending or not parts:
+            yield self._build_answer(question, items, "".join(parts), **kwargs)
+    
+    async def make_md_async(self, question: str, items: List[BaseModel], additional_context: str = "", **kwargs) -> Answer:
+        """
+        Асинхронная версия make_md: промпты строятся синхронно, запрос к LLM не блокирует event loop.
+        
+        :param question: Вопрос пользователя
+        :param items: Список элементов (Contractor, Risk, Error, Process)
+        :param additional_context: Дополнительный контекст для генерации ответа
+        :param kwargs: Дополнительные параметры специфичные для типа данных
+        :return: Модель Answer с сгенерированным ответом
+        """
+        self.pipeline_logger.log_detail(f"Начинаем асинхронную генерацию ответа на вопрос: '{question}'")
+        
+        if not items:
+            return self._build_empty_answer(question, **kwargs)
+        
+        prompts = self._prepare_answer_prompts(question, items, additional_context, kwargs)
+        
+        try:
+            self.pipeline_logger.log_detail("Отправляем асинхронный запрос к LLM для генерации ответа")
+            generated_text = await self.llm_client.agenerate_completion(
+                system_prompt=prompts['system'],
+                user_prompt=prompts['user'],
+                temperature=0.2
+            )
+            return self._build_generated_answer(question, items, generated_text, **kwargs)
+            
+        except Exception as e:
+            return self._build_fallback_answer(question, items, e, **kwargs)
+    
+    async def batch_make_md(
+        self,
+        questions: List[str],
+        items_list: List[List[BaseModel]],
+        additional_context: str = "",
+        max_concurrency: int = 10,
+        **kwargs
+    ) -> List[Answer]:
+        """
+        Генерирует ответы на несколько независимых вопросов параллельно.
+        Одновременно выполняется не более max_concurrency запросов к LLM,
+        поэтому общее время близко к N / max_concurrency запросов, а не к N.
+        
+        :param questions: Список вопросов пользователя
+        :param items_list: Список наборов элементов (по одному на каждый вопрос)
+        :param additional_context: Дополнительный контекст, общий для всех вопросов
+        :param max_concurrency: Максимальное число одновременных запросов к LLM
+        :param kwargs: Дополнительные параметры специфичные для типа данных
+        :return: Список ответов в порядке исходных вопросов
+        """
+        if len(questions) != len(items_list):
+            raise ValueError("Количество вопросов и наборов элементов должно совпадать")
+        
+        self.pipeline_logger.log_detail(f"Пакетная генерация ответов для {len(questions)} вопросов")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded_make_md(question: str, items: List[BaseModel]) -> Answer:
+            async with semaphore:
+                return await self.make_md_async(question, items, additional_context, **kwargs)
+        
+        return list(await asyncio.gather(*[
+            bounded_make_md(question, items)
+            for question, items in zip(questions, items_list)
+        ]))
+    
+    def _prepare_answer_prompts(
+        self,
+        question: str,
+        items: List[BaseModel],
+        additional_context: str,
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """
+        Преобразует элементы в данные для промпта, строит и логирует промпты.
+        
+        :param question: Вопрос пользователя
+        :param items: Список элементов
+        :param additional_context: Дополнительный контекст для генерации ответа
+        :param kwargs: Дополнительные параметры (дополняется additional_context)
+        :return: Словарь с системным и пользовательским промптами
+        """
         self.pipeline_logger.log_detail(f"Количество элементов для генерации: {len(items)}")
         
         # Преобразуем элементы в формат для промпта
         self.pipeline_logger.log_detail("Преобразуем элементы в формат для промпта")
-        items_data = []
+        items_data = [None] * len(items)
+        errors = 0
         for i, item in enumerate(items):
             try:
-                item_dict = self._convert_item_to_dict(item)
-                items_data.append(item_dict)
-                self.pipeline_logger.log_detail(f"Элемент {i+1} преобразован в словарь")
+                items_data[i] = self._convert_item_to_dict(item)
             except Exception as e:
+                errors += 1
                 self.pipeline_logger.log_detail(f"Ошибка преобразования элемента {i+1}: {e}", "WARNING")
+        if errors:
+            items_data = [item_dict for item_dict in items_data if item_dict is not None]
+        self.pipeline_logger.log_detail(
+            f"Преобразовано элементов: {len(items_data)}/{len(items)} (ошибок: {errors})"
+        )
         
         # Объединяем дополнительный контекст с kwargs для удобства
         if additional_context:
@@ -97,6 +285,10 @@ class BaseAnswerGeneratorService(ABC):
         self.pipeline_logger.log_detail("Формируем промпты для генерации ответа")
         prompts = self._get_prompts(question, items_data, **kwargs)
 
+        # Промпты для лога (включая урезанную версию) строим только в детальном режиме
+        if not self.pipeline_logger.is_detail_enabled:
+            return prompts
+
         # Создаем урезанную версию промпта для логирования
         LOG_LIMIT = 5
         if len(items_data) > LOG_LIMIT:
@@ -114,52 +306,89 @@ class BaseAnswerGeneratorService(ABC):
             user_prompt=logged_prompts['user']
         )
         
-        try:
-            # Генерируем ответ с помощью LLM
-            self.pipeline_logger.log_detail("Отправляем запрос к LLM для генерации ответа")
-            generated_text = self.llm_client.generate_completion(
-                system_prompt=prompts['system'],
-                user_prompt=prompts['user'],
-                temperature=0.2  # Немного креативности для более человечного ответа
-            )
-            
-            # Логируем результат генерации
-            text_length = len(generated_text) if generated_text else 0
-            self.pipeline_logger.log_detail(f"LLM сгенерировал ответ длиной {text_length} символов")
-            
-            # Логируем полный ответ LLM в детальном режиме
-            self.pipeline_logger.log_prompt_details(
-                prompt_type="answer_generation",
-                system_prompt="",  # Пустые, так как уже залогированы выше
-                user_prompt="",
-                response=generated_text
-            )
-            
-            # Формируем модель ответа
-            answer = Answer(
-                text=generated_text,
-                query=question,
-                total_found=len(items),
-                items=items,
-                meta=kwargs.get('meta'),
-                category=kwargs.get('category')
-            )
-            
-            self.pipeline_logger.log_detail("Ответ успешно сформирован")
-            return answer
-            
-        except Exception as e:
-            self.pipeline_logger.log_detail(f"Ошибка при генерации ответа: {e}", "ERROR")
-            
-            # В случае ошибки возвращаем базовый ответ
-            self.pipeline_logger.log_detail("Генерируем fallback ответ")
-            fallback_text = self._generate_fallback_text(question, items, **kwargs)
-            
-            return Answer(
-                text=fallback_text,
-                query=question,
-                total_found=len(items),
-                items=items,
-                meta=kwargs.get('meta'),
-                category=kwargs.get('category')
-            )
\ No newline at end of file
+        return prompts
+    
+    def _build_empty_answer(self, question: str, **kwargs) -> Answer:
+        """
+        Формирует ответ для пустого списка элементов без обращения к LLM.
+        
+        :param question: Вопрос пользователя
+        :param kwargs: Дополнительные параметры (meta, category)
+        :return: Модель Answer с готовым текстом
+        """
+        self.pipeline_logger.log_detail("Нет элементов для генерации, возвращаем готовый ответ без вызова LLM")
+        return Answer.model_construct(
+            text=self._empty_response_text(question, **kwargs),
+            query=question,
+            total_found=0,
+            items=[],
+            meta=kwargs.get('meta'),
+            category=kwargs.get('category')
+        )
+    
+    def _build_generated_answer(self, question: str, items: List[BaseModel], generated_text: str, **kwargs) -> Answer:
+        """
+        Логирует результат LLM и формирует модель ответа.
+        
+        :param question: Вопрос пользователя
+        :param items: Список элементов
+        :param generated_text: Текст, сгенерированный LLM
+        :param kwargs: Дополнительные параметры (meta, category)
+        :return: Модель Answer
+        """
+        # Answer собирается без валидации, поэтому отсутствующий текст (content=None) проверяем здесь:
+        # исключение уходит в обработчик вызывающего метода, и пользователь получает fallback ответ
+        if not isinstance(generated_text, str):
+            raise ValueError(f"LLM вернул ответ без текста: {generated_text!r}")
+        
+        # Логируем результат генерации
+        text_length = len(generated_text)
+        self.pipeline_logger.log_detail(f"LLM сгенерировал ответ длиной {text_length} символов")
+        
+        # Логируем полный ответ LLM в детальном режиме
+        self.pipeline_logger.log_response("answer_generation", generated_text)
+        
+        # Формируем модель ответа
+        answer = self._build_answer(question, items, generated_text, **kwargs)
+        
+        self.pipeline_logger.log_detail("Ответ успешно сформирован")
+        return answer
+    
+    def _build_fallback_answer(self, question: str, items: List[BaseModel], error: Exception, **kwargs) -> Answer:
+        """
+        Формирует базовый ответ в случае ошибки генерации.
+        
+        :param question: Вопрос пользователя
+        :param items: Список элементов
+        :param error: Возникшая ошибка
+        :param kwargs: Дополнительные параметры (meta, category)
+        :return: Модель Answer с fallback текстом
+        """
+        self.pipeline_logger.log_detail(f"Ошибка при генерации ответа: {error}", "ERROR")
+        
+        # В случае ошибки возвращаем базовый ответ
+        self.pipeline_logger.log_detail("Генерируем fallback ответ")
+        fallback_text = self._generate_fallback_text(question, items, **kwargs)
+        
+        return self._build_answer(question, items, fallback_text, **kwargs)
+    
+    def _build_answer(self, question: str, items: List[BaseModel], text: str, **kwargs) -> Answer:
+        """
+        Единая точка создания модели Answer для сгенерированного и fallback ответа.
+        Элементы уже являются провалидированными доменными моделями, поэтому
+        Answer собирается без повторной валидации каждого элемента.
+        
+        :param question: Вопрос пользователя
+        :param items: Список элементов
+        :param text: Текст ответа
+        :param kwargs: Дополнительные параметры (meta, category)
+        :return: Модель Answer
+        """
+        return Answer.model_construct(
+            text=text,
+            query=question,
+            total_found=len(items),
+            items=items,
+            meta=kwargs.get('meta'),
+            category=kwargs.get('category')
+        )
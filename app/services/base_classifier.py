@@ -1,11 +1,19 @@
 # app/services/base_classifier.py
 
+import asyncio
+import re
 import pandas as pd
-from typing import Dict, List, Tuple, Type
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Dict, List, Literal, Optional, Tuple, Type
 from abc import ABC, abstractmethod
 from pydantic import BaseModel, Field, create_model
 from app.adapters.llm_client import LLMClient
-from app.utils.logging import setup_logger, get_pipeline_logger
+from app.config import classification_cache_settings
+from app.services.classification_cache import ClassificationCache, keybert_question_encoder
+from app.utils.prompt_builder import PromptBuilder
+from app.utils.logging import setup_logger, get_shared_pipeline_logger
 
 # Настройка логгера
 logger = setup_logger(__name__)
@@ -17,6 +25,15 @@ class BaseClassifierService(ABC):
     Предоставляет общую логику для классификации запросов.
     """
     
+    # Сколько динамических моделей классификации хранить (полный список + суженные списки кандидатов)
+    MODEL_CACHE_SIZE = 32
+    # Максимум вопросов в одном пакетном запросе к LLM
+    BATCH_SIZE = 25
+    # Если элементов больше, они делятся на части и классифицируются параллельными запросами (None - без деления)
+    CLASSIFICATION_CHUNK_SIZE: Optional[int] = None
+    # Максимум одновременных запросов к LLM при классификации по частям
+    CHUNK_MAX_WORKERS = 8
+    
     def __init__(self, llm_client: LLMClient, entity_type: str = None):
         """
         Инициализация сервиса классификации.
@@ -26,7 +43,22 @@ class BaseClassifierService(ABC):
         """
         self.llm_client = llm_client
         self.items_list: List[str] = []
-        self.pipeline_logger = get_pipeline_logger(f"{self.__class__.__name__}")
+        # Динамические модели классификации по кортежу элементов
+        self._model_cache: "OrderedDict[Tuple[str, ...], Type[BaseModel]]" = OrderedDict()
+        # Элементы с хештег-разделителями и обратная карта "#item#" -> item, считаются в load_items
+        self._processed_items: List[str] = []
+        self._hashtag_to_original: Dict[str, str] = {}
+        # Регулярное выражение по всем элементам для поиска их упоминаний в вопросе за один проход
+        self._items_pattern: Optional[re.Pattern] = None
+        self._folded_to_item: Dict[str, str] = {}
+        # Системный промпт и статическая часть пользовательского промпта для загруженного списка
+        # (строятся при первом запросе)
+        self._system_prompt_cache: Optional[str] = None
+        self._instructions_cache: Optional[str] = None
+        # Кэш результатов классификации и ключ текущего списка элементов
+        self._classification_cache = self._create_classification_cache()
+        self._items_key: Optional[int] = None
+        self.pipeline_logger = get_shared_pipeline_logger(self.__class__.__name__)
         
         # Загружаем конфигурацию если указан тип сущности
         self._classification_config = {}
@@ -90,7 +122,7 @@ class BaseClassifierService(ABC):
             processed_item = f"#{item}#"
             processed_items.append(processed_item)
             
-        logger.debug(f"Предобработано {len(processed_items)} элементов с хештег-разделителями")
+        logger.debug("Предобработано %d элементов с хештег-разделителями", len(processed_items))
         return processed_items
 
     def _remove_hashtag_separators(self, item_with_hashtags: str) -> str:
@@ -119,11 +151,20 @@ class BaseClassifierService(ABC):
             logger.warning("Пустой список элементов для создания модели")
             items = ["Нет данных"]
         
-        # Применяем предобработку с хештег-разделителями
-        processed_items = self._preprocess_items_with_hashtags(items)
+        # Модель зависит только от списка элементов, поэтому переиспользуем ее между запросами
+        cache_key = tuple(items)
+        cached_model = self._model_cache.get(cache_key)
+        if cached_model is not None:
+            self._model_cache.move_to_end(cache_key)
+            return cached_model
+        
+        # Применяем предобработку с хештег-разделителями (для загруженного списка она уже готова)
+        if items is self.items_list and self._processed_items:
+            processed_items = self._processed_items
+        else:
+            processed_items = self._preprocess_items_with_hashtags(items)
         
         # Создаем Literal тип из списка обработанных элементов
-        from typing import Literal
         literal_type = Literal[tuple(processed_items)]
         
         # Создаем модель для одного результата сопоставления
@@ -142,9 +183,42 @@ class BaseClassifierService(ABC):
                 min_items=1, max_items=3))
         )
         
-        logger.debug(f"Создана динамическая модель для {len(items)} элементов")
+        logger.debug("Создана динамическая модель для %d элементов", len(items))
+        self._model_cache[cache_key] = ClassificationResult
+        if len(self._model_cache) > self.MODEL_CACHE_SIZE:
+            self._model_cache.popitem(last=False)
         return ClassificationResult
     
+    def _create_dynamic_batch_classification_model(self, items: List[str]) -> Type[BaseModel]:
+        """
+        Создает модель ответа для пакетной классификации: список результатов одиночной
+        классификации, дополненных номером вопроса.
+        
+        :param items: Список доступных элементов для выбора
+        :return: Класс модели Pydantic
+        """
+        # Пустая строка не бывает элементом, поэтому такой ключ не пересекается с ключами одиночных моделей
+        cache_key = ("",) + tuple(items)
+        cached_model = self._model_cache.get(cache_key)
+        if cached_model is not None:
+            self._model_cache.move_to_end(cache_key)
+            return cached_model
+        
+        ClassificationResult = self._create_dynamic_classification_model(items)
+        QuestionClassificationResult = create_model(
+            'QuestionClassificationResult',
+            __base__=ClassificationResult,
+            question_index=(int, Field(..., ge=1, description="Номер запроса в списке"))
+        )
+        BatchClassificationResult = create_model(
+            'BatchClassificationResult',
+            results=(List[QuestionClassificationResult], Field(..., description="Результаты по каждому запросу"))
+        )
+        self._model_cache[cache_key] = BatchClassificationResult
+        if len(self._model_cache) > self.MODEL_CACHE_SIZE:
+            self._model_cache.popitem(last=False)
+        return BatchClassificationResult
+    
     def load_items(self, df: pd.DataFrame) -> List[str]:
         """
         Загружает список уникальных элементов из DataFrame.
@@ -156,13 +230,28 @@ class BaseClassifierService(ABC):
         
         try:
             if column_name in df.columns:
-                # Фильтруем пустые значения и преобразуем в список
-                unique_items = df[column_name].dropna().unique().tolist()
+                column = df[column_name]
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    # Категориальная колонка: уникальные значения по целочисленным кодам, в порядке появления
+                    codes = column.cat.codes.to_numpy()
+                    unique_values = column.cat.categories.take(pd.unique(codes[codes >= 0])).to_numpy()
+                else:
+                    # Уникальные значения напрямую по массиву, без промежуточных Series от dropna()
+                    unique_values = pd.unique(column.to_numpy())
                 
-                # Фильтруем пустые строки
-                unique_items = [item for item in unique_items if item and isinstance(item, str)]
+                # Отбрасываем NaN, пустые строки и нестроковые значения
+                unique_items = [item for item in unique_values.tolist() if item and isinstance(item, str)]
                 
-                logger.info(f"Загружено {len(unique_items)} уникальных элементов из колонки '{column_name}'")
+                logger.info("Загружено %d уникальных элементов из колонки '%s'", len(unique_items), column_name)
+                if unique_items != self.items_list:
+                    # Модели и результаты классификации привязаны к содержимому списка и вытесняются по LRU/TTL,
+                    # поэтому здесь не сбрасываются: сервис-синглтон попеременно обслуживает разные списки
+                    self._processed_items = self._preprocess_items_with_hashtags(unique_items)
+                    self._hashtag_to_original = dict(zip(self._processed_items, unique_items))
+                    self._system_prompt_cache = None
+                    self._instructions_cache = None
+                    self._build_items_pattern(unique_items)
+                    self._items_key = hash(tuple(unique_items))
                 self.items_list = unique_items
                 return unique_items
             else:
@@ -179,21 +268,276 @@ class BaseClassifierService(ABC):
         :param question: Вопрос пользователя
         :return: Наиболее релевантный элемент
         """
+        mentioned_items = self._find_mentioned_items(question)
+        resolved = self._resolve_without_llm(mentioned_items) or self._get_cached_classification(question)
+        if resolved:
+            return resolved
+        
+        chunks = self._split_candidates(mentioned_items)
+        if chunks:
+            return self._store_classification(question, self._classify_in_chunks(question, chunks))
+        
+        request = self._prepare_classification_request(question, mentioned_items)
+        if request is None:
+            return ""
+        classification_model, prompts = request
+        
+        try:
+            # Вызываем API для структурированного ответа
+            self.pipeline_logger.log_detail("Отправляем запрос к LLM для классификации")
+            result = self.llm_client.generate_structured_completion(
+                system_prompt=prompts['system'],
+                user_prompt=prompts['user'],
+                response_model=classification_model,
+                temperature=0
+            )
+            return self._store_classification(question, self._select_best_item(result))
+                
+        except Exception as e:
+            self.pipeline_logger.log_detail(f"Ошибка при классификации запроса: {e}", "ERROR")
+            return ""
+    
+    async def classify_async(self, question: str) -> str:
+        """
+        Асинхронная версия classify: запрос к LLM не блокирует event loop,
+        что позволяет классифицировать несколько вопросов параллельно.
+        
+        :param question: Вопрос пользователя
+        :return: Наиболее релевантный элемент
+        """
+        mentioned_items = self._find_mentioned_items(question)
+        resolved = self._resolve_without_llm(mentioned_items) or self._get_cached_classification(question)
+        if resolved:
+            return resolved
+        
+        chunks = self._split_candidates(mentioned_items)
+        if chunks:
+            return self._store_classification(question, await self._classify_in_chunks_async(question, chunks))
+        
+        request = self._prepare_classification_request(question, mentioned_items)
+        if request is None:
+            return ""
+        classification_model, prompts = request
+        
+        try:
+            self.pipeline_logger.log_detail("Отправляем асинхронный запрос к LLM для классификации")
+            result = await self.llm_client.agenerate_structured_completion(
+                system_prompt=prompts['system'],
+                user_prompt=prompts['user'],
+                response_model=classification_model,
+                temperature=0
+            )
+            return self._store_classification(question, self._select_best_item(result))
+                
+        except Exception as e:
+            self.pipeline_logger.log_detail(f"Ошибка при классификации запроса: {e}", "ERROR")
+            return ""
+    
+    async def classify_many(self, questions: List[str], max_concurrency: int = 10) -> List[str]:
+        """
+        Классифицирует несколько вопросов параллельными запросами к LLM.
+        Одновременно выполняется не более max_concurrency запросов.
+        Из синхронного кода без работающего event loop: asyncio.run(classifier.classify_many(...)).
+        
+        :param questions: Список вопросов пользователей
+        :param max_concurrency: Максимальное число одновременных запросов к LLM
+        :return: Список элементов в порядке вопросов
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded_classify(question: str) -> str:
+            async with semaphore:
+                return await self.classify_async(question)
+        
+        return list(await asyncio.gather(*[bounded_classify(question) for question in questions]))
+    
+    def classify_batch(self, questions: List[str]) -> List[str]:
+        """
+        Классифицирует несколько вопросов, отправляя к LLM по одному запросу на пачку
+        (не более BATCH_SIZE вопросов) вместо запроса на каждый вопрос.
+        
+        :param questions: Список вопросов пользователей
+        :return: Список элементов в порядке вопросов (пустая строка, если классификация не удалась)
+        """
+        results = [""] * len(questions)
+        
+        # Очевидные и уже известные ответы не отправляем в LLM
+        pending = []
+        for position, question in enumerate(questions):
+            resolved = (
+                self._resolve_without_llm(self._find_mentioned_items(question))
+                or self._get_cached_classification(question)
+            )
+            if resolved:
+                results[position] = resolved
+            else:
+                pending.append((position, question))
+        
+        if not pending:
+            return results
+        if not self.items_list:
+            self.pipeline_logger.log_detail("Список элементов пуст, невозможно классифицировать запросы", "WARNING")
+            return results
+        
+        batch_model = self._create_dynamic_batch_classification_model(self.items_list)
+        self.pipeline_logger.log_detail(f"Пакетная классификация {len(pending)} вопросов")
+        
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            chunk = pending[start:start + self.BATCH_SIZE]
+            prompts = self._build_batch_classification_prompts([question for _, question in chunk])
+            
+            try:
+                result = self.llm_client.generate_structured_completion(
+                    system_prompt=prompts['system'],
+                    user_prompt=prompts['user'],
+                    response_model=batch_model,
+                    temperature=0
+                )
+            except Exception as e:
+                self.pipeline_logger.log_detail(f"Ошибка при пакетной классификации: {e}", "ERROR")
+                continue
+            
+            if result is None:
+                self.pipeline_logger.log_detail("Модель не вернула пакетный ответ", "WARNING")
+                continue
+            
+            by_index = {entry.question_index: entry for entry in result.results}
+            for number, (position, question) in enumerate(chunk, 1):
+                entry = by_index.get(number)
+                if entry is not None:
+                    results[position] = self._store_classification(question, self._select_best_item(entry))
+        
+        return results
+    
+    def _create_classification_cache(self) -> Optional[ClassificationCache]:
+        """
+        Создает кэш результатов классификации согласно настройкам.
+        
+        :return: Кэш или None, если кэширование выключено
+        """
+        if not classification_cache_settings.enabled:
+            return None
+        encoder = keybert_question_encoder if classification_cache_settings.semantic_enabled else None
+        return ClassificationCache(
+            max_size=classification_cache_settings.max_size,
+            semantic_threshold=classification_cache_settings.semantic_threshold,
+            encoder=encoder,
+            ttl_seconds=classification_cache_settings.ttl_seconds or None
+        )
+    
+    def _get_cached_classification(self, question: str) -> Optional[str]:
+        """
+        Возвращает результат классификации этого (или похожего) вопроса, если он уже был получен.
+        
+        :param question: Вопрос пользователя
+        :return: Элемент из кэша или None
+        """
+        if self._classification_cache is None or not self.items_list:
+            return None
+        cached_item = self._classification_cache.get(question, self._items_key)
+        if cached_item:
+            self.pipeline_logger.log_detail(f"Результат классификации взят из кэша: '{cached_item}'")
+        return cached_item
+    
+    def _store_classification(self, question: str, item: str) -> str:
+        """
+        Сохраняет успешный результат классификации в кэш.
+        
+        :param question: Вопрос пользователя
+        :param item: Выбранный элемент
+        :return: Тот же элемент (для использования в return)
+        """
+        if item and self._classification_cache is not None:
+            self._classification_cache.set(question, self._items_key, item)
+        return item
+    
+    def _build_items_pattern(self, items: List[str]) -> None:
+        """
+        Компилирует одно регулярное выражение со всеми элементами (длинные варианты первыми),
+        чтобы находить упоминания элементов в вопросе за один проход по тексту.
+        
+        :param items: Список элементов
+        """
+        self._folded_to_item = {}
+        for item in items:
+            self._folded_to_item.setdefault(item.casefold(), item)
+        
+        if not self._folded_to_item:
+            self._items_pattern = None
+            return
+        
+        alternatives = sorted(self._folded_to_item, key=len, reverse=True)
+        self._items_pattern = re.compile(
+            r'(?<!\w)(?:' + '|'.join(map(re.escape, alternatives)) + r')(?!\w)'
+        )
+    
+    def _find_mentioned_items(self, question: str) -> List[str]:
+        """
+        Находит элементы, дословно (как целые слова, без учета регистра) упомянутые в вопросе.
+        
+        :param question: Вопрос пользователя
+        :return: Список упомянутых элементов без повторов
+        """
+        if self._items_pattern is None:
+            return []
+        
+        mentioned = {}
+        for match in self._items_pattern.finditer(question.casefold()):
+            item = self._folded_to_item.get(match.group(0))
+            if item is not None:
+                mentioned[item] = None
+        return list(mentioned)
+    
+    def _resolve_without_llm(self, mentioned_items: List[str]) -> Optional[str]:
+        """
+        Определяет элемент без обращения к LLM, если ответ очевиден:
+        в списке единственный элемент или вопрос упоминает ровно один элемент.
+        
+        :param mentioned_items: Элементы, упомянутые в вопросе
+        :return: Найденный элемент или None, если нужна классификация через LLM
+        """
+        if len(self.items_list) == 1:
+            self.pipeline_logger.log_detail(f"В списке один элемент, классификация не требуется: '{self.items_list[0]}'")
+            return self.items_list[0]
+        
+        if len(mentioned_items) == 1:
+            self.pipeline_logger.log_detail(f"Элемент найден в вопросе напрямую: '{mentioned_items[0]}'")
+            return mentioned_items[0]
+        return None
+    
+    def _prepare_classification_request(
+        self,
+        question: str,
+        candidates: Optional[List[str]] = None
+    ) -> Optional[Tuple[Type[BaseModel], Dict[str, str]]]:
+        """
+        Готовит динамическую модель ответа и промпты для классификации.
+        
+        :param question: Вопрос пользователя
+        :param candidates: Элементы, упомянутые в вопросе; если их несколько, LLM выбирает только среди них
+        :return: Кортеж (модель ответа, промпты) или None, если классифицировать нечего
+        """
         self.pipeline_logger.log_detail(f"Начинаем классификацию запроса: '{question}'")
         
         if not self.items_list:
             self.pipeline_logger.log_detail("Список элементов пуст, невозможно классифицировать запрос", "WARNING")
-            return ""
+            return None
         
-        self.pipeline_logger.log_detail(f"Доступно элементов для классификации: {len(self.items_list)}")
+        if candidates and len(candidates) > 1:
+            # Вопрос упоминает несколько элементов - сужаем выбор до них, это сокращает и промпт, и Literal
+            self.pipeline_logger.log_detail(f"Вопрос упоминает {len(candidates)} элементов, классифицируем только среди них")
+            items = candidates
+            processed_items_for_prompt = self._preprocess_items_with_hashtags(candidates)
+        else:
+            items = self.items_list
+            # Элементы с хештег-разделителями для списка в промпте подготовлены в load_items
+            processed_items_for_prompt = self._processed_items or self._preprocess_items_with_hashtags(items)
+        
+        self.pipeline_logger.log_detail(f"Доступно элементов для классификации: {len(items)}")
         
         # Создаем динамическую модель для текущего списка элементов
         self.pipeline_logger.log_detail("Создаем динамическую модель классификации")
-        classification_model = self._create_dynamic_classification_model(self.items_list)
-        
-        # Применяем предобработку с хештег-разделителями для списка в промпте
-        self.pipeline_logger.log_detail("Применяем хештег-разделители к списку элементов для промпта")
-        processed_items_for_prompt = self._preprocess_items_with_hashtags(self.items_list)
+        classification_model = self._create_dynamic_classification_model(items)
 
         # Получаем промпты для классификации
         self.pipeline_logger.log_detail("Формируем промпты для классификации")
@@ -206,85 +550,242 @@ class BaseClassifierService(ABC):
             user_prompt=prompts['user']
         )
         
-        try:
-            # Вызываем API для структурированного ответа
-            self.pipeline_logger.log_detail("Отправляем запрос к LLM для классификации")
-            result = self.llm_client.generate_structured_completion(
+        return classification_model, prompts
+    
+    def _split_candidates(self, mentioned_items: List[str]) -> Optional[List[List[str]]]:
+        """
+        Делит элементы-кандидаты на части, если их больше CLASSIFICATION_CHUNK_SIZE.
+        Части идут подряд и отличаются по размеру не более чем на один элемент,
+        поэтому в каждой оказывается хотя бы два элемента.
+        
+        :param mentioned_items: Элементы, упомянутые в вопросе
+        :return: Список частей или None, если делить не нужно
+        """
+        candidates = mentioned_items if len(mentioned_items) > 1 else self.items_list
+        chunk_size = self.CLASSIFICATION_CHUNK_SIZE
+        if not chunk_size or len(candidates) <= chunk_size:
+            return None
+        
+        chunk_count = -(-len(candidates) // chunk_size)
+        base_size, extra = divmod(len(candidates), chunk_count)
+        chunks = []
+        start = 0
+        for i in range(chunk_count):
+            end = start + base_size + (1 if i < extra else 0)
+            chunks.append(candidates[start:end])
+            start = end
+        return chunks
+    
+    def _build_chunk_requests(self, question: str, chunks: List[List[str]]) -> List[Tuple[Type[BaseModel], Dict[str, str]]]:
+        """
+        Строит модели ответа и промпты для каждой части элементов.
+        
+        :param question: Вопрос пользователя
+        :param chunks: Части списка элементов
+        :return: Список кортежей (модель ответа, промпты)
+        """
+        self.pipeline_logger.log_detail(
+            f"Классифицируем запрос '{question}' по {len(chunks)} частям списка элементов параллельно"
+        )
+        return [
+            (
+                self._create_dynamic_classification_model(chunk),
+                self._build_classification_prompts(question, self._preprocess_items_with_hashtags(chunk))
+            )
+            for chunk in chunks
+        ]
+    
+    def _classify_in_chunks(self, question: str, chunks: List[List[str]]) -> str:
+        """
+        Классифицирует вопрос по частям списка элементов параллельными запросами к LLM
+        и выбирает элемент с наивысшей оценкой среди всех частей.
+        
+        :param question: Вопрос пользователя
+        :param chunks: Части списка элементов
+        :return: Лучший элемент или пустая строка
+        """
+        requests = self._build_chunk_requests(question, chunks)
+        
+        def classify_chunk(request: Tuple[Type[BaseModel], Dict[str, str]]) -> Optional[BaseModel]:
+            classification_model, prompts = request
+            return self.llm_client.generate_structured_completion(
                 system_prompt=prompts['system'],
                 user_prompt=prompts['user'],
                 response_model=classification_model,
                 temperature=0
             )
-            
-            if result and hasattr(result, 'top_matches'):
-                top_matches = result.top_matches
-                
-                # Логируем результат классификации
-                self.pipeline_logger.log_detail(f"Рассуждение модели: {result.reasoning}")
-                
-                # Логируем все результаты
-                for i, match in enumerate(top_matches, 1):
-                    self.pipeline_logger.log_detail(f"Вариант {i}: {match.item} (оценка: {match.score})")
-                
-                # Логируем полный ответ LLM в детальном режиме
-                self.pipeline_logger.log_prompt_details(
-                    prompt_type="classification",
-                    system_prompt="",  # Пустые, так как уже залогированы выше
-                    user_prompt="",
-                    response=str(result)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(requests), self.CHUNK_MAX_WORKERS)) as executor:
+                results = list(executor.map(classify_chunk, requests))
+        except Exception as e:
+            self.pipeline_logger.log_detail(f"Ошибка при классификации запроса по частям: {e}", "ERROR")
+            return ""
+        
+        return self._select_best_across_chunks(results)
+    
+    async def _classify_in_chunks_async(self, question: str, chunks: List[List[str]]) -> str:
+        """
+        Асинхронная версия _classify_in_chunks: запросы по всем частям отправляются через asyncio.gather.
+        
+        :param question: Вопрос пользователя
+        :param chunks: Части списка элементов
+        :return: Лучший элемент или пустая строка
+        """
+        requests = self._build_chunk_requests(question, chunks)
+        
+        try:
+            results = await asyncio.gather(*[
+                self.llm_client.agenerate_structured_completion(
+                    system_prompt=prompts['system'],
+                    user_prompt=prompts['user'],
+                    response_model=classification_model,
+                    temperature=0
                 )
-                
-                # Возвращаем элемент с наивысшей оценкой
-                if top_matches:
-                    best_match = max(top_matches, key=lambda x: x.score)
-                    
-                    # Убираем хештег-разделители из результата
-                    clean_item = self._remove_hashtag_separators(best_match.item)
-                    
-                    self.pipeline_logger.log_detail(f"Выбран лучший элемент: '{clean_item}' с оценкой {best_match.score}")
-                    return clean_item
-            
+                for classification_model, prompts in requests
+            ])
+        except Exception as e:
+            self.pipeline_logger.log_detail(f"Ошибка при классификации запроса по частям: {e}", "ERROR")
+            return ""
+        
+        return self._select_best_across_chunks(results)
+    
+    def _select_best_across_chunks(self, results: List[Optional[BaseModel]]) -> str:
+        """
+        Выбирает элемент с наивысшей оценкой среди ответов по всем частям.
+        
+        :param results: Структурированные ответы модели по частям (None для неудачных)
+        :return: Лучший элемент без хештег-разделителей или пустая строка
+        """
+        matches = [match for result in results if result is not None for match in result.top_matches]
+        if not matches:
+            self.pipeline_logger.log_detail("Модель не вернула ни одного варианта ни по одной части", "WARNING")
+            return ""
+        
+        best_match = max(matches, key=attrgetter('score'))
+        clean_item = self._clean_item(best_match.item)
+        self.pipeline_logger.log_detail(
+            f"Выбран лучший элемент по {len(results)} частям: '{clean_item}' с оценкой {best_match.score}"
+        )
+        return clean_item
+    
+    def _clean_item(self, processed_item: str) -> str:
+        """
+        Возвращает исходное название элемента по варианту с хештег-разделителями из ответа LLM.
+        
+        :param processed_item: Элемент из ответа модели
+        :return: Элемент без хештег-разделителей
+        """
+        clean_item = self._hashtag_to_original.get(processed_item)
+        if clean_item is None:
+            clean_item = self._remove_hashtag_separators(processed_item)
+        return clean_item
+    
+    def _select_best_item(self, result: Optional[BaseModel]) -> str:
+        """
+        Выбирает элемент с наивысшей оценкой из структурированного ответа LLM.
+        
+        :param result: Структурированный ответ модели классификации
+        :return: Лучший элемент без хештег-разделителей или пустая строка
+        """
+        # Ответ валидирован Pydantic-моделью, поэтому top_matches гарантированно присутствует
+        if result is None:
             self.pipeline_logger.log_detail("Модель не вернула структурированный ответ", "WARNING")
             return ""
-                
-        except Exception as e:
-            self.pipeline_logger.log_detail(f"Ошибка при классификации запроса: {e}", "ERROR")
+        top_matches = result.top_matches
+        
+        if self.pipeline_logger.is_detail_enabled:
+            # Логируем результат классификации
+            self.pipeline_logger.log_detail(f"Рассуждение модели: {result.reasoning}")
+            
+            # Логируем все результаты
+            for i, match in enumerate(top_matches, 1):
+                self.pipeline_logger.log_detail(f"Вариант {i}: {match.item} (оценка: {match.score})")
+            
+            # Логируем полный ответ LLM в детальном режиме
+            self.pipeline_logger.log_response("classification", str(result))
+        
+        if not top_matches:
+            self.pipeline_logger.log_detail("Модель не вернула ни одного варианта", "WARNING")
             return ""
+        
+        # Возвращаем элемент с наивысшей оценкой
+        best_match = max(top_matches, key=attrgetter('score'))
+        
+        # Убираем хештег-разделители из результата
+        clean_item = self._clean_item(best_match.item)
+        
+        self.pipeline_logger.log_detail(f"Выбран лучший элемент: '{clean_item}' с оценкой {best_match.score}")
+        return clean_item
     
-    def filter_items(self, df: pd.DataFrame, item_value: str) -> Tuple[pd.DataFrame, Dict[int, float]]:
+    def filter_items(
+        self,
+        df: pd.DataFrame,
+        item_value: str,
+        copy: bool = False
+    ) -> Tuple[pd.DataFrame, Dict[int, float]]:
         """
         Фильтрует DataFrame по значению элемента.
+        Если фильтровать нечего, возвращается исходный DataFrame без копирования.
         
         :param df: DataFrame с данными
         :param item_value: Значение для фильтрации
+        :param copy: Вернуть независимую копию отфильтрованных данных (нужно, только если их будут изменять)
         :return: Кортеж из отфильтрованного DataFrame и словаря оценок
         """
         column_name = self.get_column_name()
-        logger.info(f"Фильтрация по колонке '{column_name}' со значением: '{item_value}'")
+        logger.info("Фильтрация по колонке '%s' со значением: '%s'", column_name, item_value)
         
         if not item_value:
             logger.warning("Не указано значение для фильтрации, возвращаем все данные")
-            return df.copy(), {}
+            return df, {}
         
         # Проверяем наличие колонки
         if column_name not in df.columns:
             logger.warning(f"Колонка '{column_name}' не найдена в данных")
-            return df.copy(), {}
+            return df, {}
         
-        # Фильтрация с учетом регистра
-        filtered_df = df[df[column_name].str.lower() == item_value.lower()].copy()
+        # Фильтрация без учета регистра (casefold корректно сравнивает и не-ASCII символы).
+        # DataFrame перечитывается на каждый запрос, поэтому одна векторная маска дешевле любого индекса
+        mask = df[column_name].str.casefold() == item_value.casefold()
         
-        # Если не найдено элементов, возвращаем пустой DataFrame
-        if len(filtered_df) == 0:
+        # Если не найдено элементов, возвращаем пустой срез с теми же колонками и типами
+        if not mask.any():
             logger.warning(f"Не найдено элементов со значением '{item_value}' в колонке '{column_name}'")
-            return pd.DataFrame(), {}
+            return df.iloc[:0], {}
+        
+        # Copy-on-Write включен при инициализации, поэтому копия нужна только по явному запросу
+        filtered_df = df[mask]
+        if copy:
+            filtered_df = filtered_df.copy()
         
         # Создаем словарь с оценками релевантности (все строки с равной оценкой)
-        scores = {idx: 1.0 for idx in filtered_df.index}
+        scores = dict.fromkeys(filtered_df.index.tolist(), 1.0)
         
-        logger.info(f"Найдено {len(filtered_df)} элементов")
+        logger.info("Найдено %d элементов", len(filtered_df))
         return filtered_df, scores
     
+    def _build_batch_classification_prompts(self, questions: List[str]) -> Dict[str, str]:
+        """
+        Строит промпты для пакетной классификации по загруженному списку элементов.
+        
+        :param questions: Список вопросов пользователей
+        :return: Словарь с системным и пользовательским промптами
+        """
+        processed_items = self._processed_items or self._preprocess_items_with_hashtags(self.items_list)
+        item_type = self.get_item_type()
+        
+        if processed_items is self._processed_items and self._system_prompt_cache is None:
+            self._system_prompt_cache = PromptBuilder.build_classification_system_prompt(processed_items, item_type)
+        system_prompt = self._system_prompt_cache if processed_items is self._processed_items else None
+        
+        return PromptBuilder.build_batch_classification_prompt(
+            questions=questions,
+            items=processed_items,
+            item_type=item_type,
+            system_prompt=system_prompt
+        )
+    
     def _build_classification_prompts(self, question: str, processed_items: List[str] = None) -> Dict[str, str]:
         """
         Строит промпты для классификации запроса.
@@ -293,14 +794,25 @@ class BaseClassifierService(ABC):
         :param processed_items: Обработанные элементы с хештег-разделителями (опционально)
         :return: Словарь с системным и пользовательским промптами
         """
-        from app.utils.prompt_builder import PromptBuilder
-        
         # Используем обработанные элементы если переданы, иначе исходные
         items_for_prompt = processed_items if processed_items is not None else self.items_list
+        item_type = self.get_item_type()
+        
+        # Промпты для загруженного списка не зависят от вопроса, кроме его самого - строим их один раз
+        system_prompt = instructions = None
+        if items_for_prompt is self._processed_items:
+            if self._system_prompt_cache is None:
+                self._system_prompt_cache = PromptBuilder.build_classification_system_prompt(items_for_prompt, item_type)
+            if self._instructions_cache is None:
+                self._instructions_cache = PromptBuilder.build_classification_instructions(items_for_prompt, item_type)
+            system_prompt = self._system_prompt_cache
+            instructions = self._instructions_cache
         
         # Используем универсальный метод PromptBuilder
         return PromptBuilder.build_classification_prompt(
             question=question,
             items=items_for_prompt,
-            item_type=self.get_item_type()
+            item_type=item_type,
+            system_prompt=system_prompt,
+            instructions=instructions
         )
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 import pandas as pd
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Tuple
 from app.utils.logging import setup_logger
 
 # Настройка логгера
@@ -32,31 +32,35 @@ class BaseNormalizationService(ABC):
         :param df: Исходный DataFrame
         :return: Нормализованный DataFrame
         """
-        logger.info(f"Начало нормализации данных. Исходное количество строк: {len(df)}")
+        logger.info("Начало нормализации данных. Исходное количество строк: %d", len(df))
         
         # Получаем маппинг колонок из наследника
         column_mapping = self.get_column_mapping()
         
-        # Переименовываем колонки, если они есть
-        df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns}, inplace=True)
+        # Переименовываем колонки, если они есть (прямая замена заголовков без механизма rename)
+        mapping_get = column_mapping.get
+        df.columns = [mapping_get(col, col) for col in df.columns]
         
-        # Логируем информацию о колонках
-        logger.info(f"Колонки после переименования: {', '.join(df.columns)}")
+        # Логируем информацию о колонках (строку со списком собираем, только если INFO включен)
+        if logger.isEnabledFor(20):  # INFO level
+            logger.info("Колонки после переименования: %s", ', '.join(df.columns))
         
-        # Заполняем пустые значения и нормализуем текстовые поля
-        for col in df.columns:
-            if df[col].dtype == 'object':  # Строковые колонки
-                # Заполняем пустые значения пустой строкой
-                df[col] = df[col].fillna('')
-                # Удаляем лишние пробелы в начале и конце
-                df[col] = df[col].astype(str).str.strip()
-                # Нормализуем пробелы между словами (убираем двойные пробелы)
-                df[col] = df[col].str.replace(r'\s+', ' ', regex=True)
+        # Заполняем пустые значения и нормализуем текстовые поля:
+        # пустые значения -> '', обрезка пробелов по краям, схлопывание двойных пробелов
+        # (пропуски заполняются одним вызовом на весь блок текстовых колонок, а не по колонке;
+        # split() без аргументов сразу и обрезает края, и схлопывает любые пробельные последовательности)
+        text_columns = df.select_dtypes(include='object').columns
+        df[text_columns] = df[text_columns].fillna('')
+        for col in text_columns:
+            df[col] = [
+                ' '.join((value if isinstance(value, str) else str(value)).split())
+                for value in df[col].to_numpy()
+            ]
         
         # Вызываем дополнительную обработку, если она нужна
         df = self._additional_processing(df)
         
-        logger.info(f"Данные успешно нормализованы. Конечное количество строк: {len(df)}")
+        logger.info("Данные успешно нормализованы. Конечное количество строк: %d", len(df))
         return df
     
     def _additional_processing(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -67,4 +71,19 @@ class BaseNormalizationService(ABC):
         :param df: DataFrame после базовой нормализации
         :return: DataFrame после дополнительной обработки
         """
-        return df
\ No newline at end of file
+        return df
+    
+    @staticmethod
+    def _to_categorical(df: pd.DataFrame, columns: Tuple[str, ...]) -> pd.DataFrame:
+        """
+        Переводит повторяющиеся текстовые колонки в категориальный тип (если они есть в данных):
+        значения хранятся один раз, а уникальные значения и фильтрация работают с целочисленными кодами.
+        
+        :param df: DataFrame после базовой нормализации
+        :param columns: Названия колонок
+        :return: DataFrame с категориальными колонками
+        """
+        for col in columns:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        return df
@@ -0,0 +1,174 @@
+# app/services/classification_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+import numpy as np
+from app.utils.logging import setup_logger
+
+# Настройка логгера
+logger = setup_logger(__name__)
+
+# Варианты написания, не влияющие на смысл вопроса: кавычки, тире и "ё" приводятся к одной форме
+_CANONICAL_CHARS = str.maketrans({
+    "«": '"', "»": '"', "„": '"', "“": '"', "”": '"', "'": '"', "‘": '"', "’": '"',
+    "–": "-", "—": "-",
+    "ё": "е",
+})
+# Завершающая пунктуация вопроса на результат классификации не влияет
+_TRAILING_PUNCTUATION = "?!.… "
+
+
+class ClassificationCache:
+    """
+    Кэш результатов классификации вопросов.
+    Первый уровень - точное совпадение нормализованного вопроса,
+    второй (опционально) - семантическая близость вопросов по эмбеддингам.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 512,
+        semantic_threshold: float = 0.92,
+        encoder: Optional[Callable[[str], np.ndarray]] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Инициализация кэша.
+
+        :param max_size: Максимальное количество хранимых результатов
+        :param semantic_threshold: Минимальное косинусное сходство для семантического попадания
+        :param encoder: Функция, возвращающая нормализованный эмбеддинг текста (None - только точный уровень)
+        :param ttl_seconds: Время жизни результата в секундах (None - без ограничения)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold
+        self.encoder = encoder
+        # (нормализованный вопрос, ключ списка элементов) -> (элемент, эмбеддинг вопроса, момент устаревания)
+        self._storage: "OrderedDict[Tuple[str, Hashable], Tuple[str, Optional[np.ndarray], float]]" = OrderedDict()
+        # Эмбеддинги вопросов, посчитанные при промахе, чтобы не кодировать вопрос повторно в set()
+        self._pending_embeddings: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        """
+        Нормализует вопрос для точного сравнения: регистр, лишние пробелы, вид кавычек и тире,
+        "ё"/"е" и завершающие знаки препинания не важны.
+
+        :param question: Вопрос пользователя
+        :return: Нормализованный вопрос
+        """
+        return " ".join(question.casefold().translate(_CANONICAL_CHARS).split()).rstrip(_TRAILING_PUNCTUATION)
+
+    def get(self, question: str, items_key: Hashable) -> Optional[str]:
+        """
+        Возвращает закэшированный результат классификации.
+
+        :param question: Вопрос пользователя
+        :param items_key: Ключ текущего списка элементов
+        :return: Выбранный ранее элемент или None
+        """
+        normalized = self.normalize(question)
+        key = (normalized, items_key)
+
+        with self._lock:
+            cached = self._storage.get(key)
+            if cached is not None:
+                if cached[2] > time.monotonic():
+                    self._storage.move_to_end(key)
+                    self.hits += 1
+                    return cached[0]
+                del self._storage[key]
+
+        if self.encoder is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        embedding = self._encode(normalized)
+        if embedding is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._pending_embeddings[normalized] = embedding
+            if len(self._pending_embeddings) > self.max_size:
+                self._pending_embeddings.clear()
+
+            now = time.monotonic()
+            candidates = [
+                (entry_key, item, entry_embedding)
+                for entry_key, (item, entry_embedding, expires_at) in self._storage.items()
+                if entry_key[1] == items_key and entry_embedding is not None and expires_at > now
+            ]
+            if candidates:
+                similarities = np.stack([c[2] for c in candidates]) @ embedding
+                best = int(similarities.argmax())
+                if similarities[best] >= self.semantic_threshold:
+                    entry_key, item, _ = candidates[best]
+                    self._storage.move_to_end(entry_key)
+                    self.semantic_hits += 1
+                    logger.debug(f"Семантическое попадание в кэш классификации (сходство {similarities[best]:.3f})")
+                    return item
+
+            self.misses += 1
+        return None
+
+    def set(self, question: str, items_key: Hashable, item: str) -> None:
+        """
+        Сохраняет результат классификации.
+
+        :param question: Вопрос пользователя
+        :param items_key: Ключ текущего списка элементов
+        :param item: Выбранный элемент
+        """
+        normalized = self.normalize(question)
+        with self._lock:
+            embedding = self._pending_embeddings.pop(normalized, None)
+        if embedding is None and self.encoder is not None:
+            embedding = self._encode(normalized)
+
+        with self._lock:
+            key = (normalized, items_key)
+            expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+            self._storage[key] = (item, embedding, expires_at)
+            self._storage.move_to_end(key)
+            if len(self._storage) > self.max_size:
+                self._storage.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._storage.clear()
+            self._pending_embeddings.clear()
+
+    def _encode(self, text: str) -> Optional[np.ndarray]:
+        """
+        Кодирует текст, не прерывая классификацию при ошибке энкодера.
+
+        :param text: Нормализованный вопрос
+        :return: Эмбеддинг или None
+        """
+        try:
+            return np.asarray(self.encoder(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Не удалось получить эмбеддинг вопроса для кэша классификации: {e}")
+            return None
+
+
+def keybert_question_encoder(text: str) -> np.ndarray:
+    """
+    Кодирует вопрос моделью, уже загруженной для KeyBERT, чтобы не держать в памяти вторую модель.
+
+    :param text: Текст вопроса
+    :return: Нормализованный эмбеддинг
+    """
+    from app.services.keybert_service import get_keybert_service
+    return get_keybert_service().model.encode(text, normalize_embeddings=True)
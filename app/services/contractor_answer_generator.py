@@ -1,5 +1,6 @@
 # app/services/contractor_answer_generator.py
 
+from operator import attrgetter
 from typing import List, Dict, Any
 from app.services.base_answer_generator import BaseAnswerGeneratorService
 from app.domain.models.contractor import Contractor
@@ -9,6 +10,12 @@ from app.utils.prompt_builder import PromptBuilder
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Поля подрядчика для промпта (извлекаются одним вызовом)
+_CONTRACTOR_FIELDS = attrgetter(
+    'name', 'work_types', 'contact_person', 'contacts',
+    'website', 'projects', 'comments', 'primary_info', 'staff_size', 'relevance_score'
+)
+
 
 class AnswerGeneratorService(BaseAnswerGeneratorService):
     """
@@ -22,15 +29,17 @@ class AnswerGeneratorService(BaseAnswerGeneratorService):
         :param item: Модель подрядчика
         :return: Словарь с данными подрядчика
         """
+        (name, work_types, contact_person, contacts,
+         website, projects, comments, primary_info, staff_size, relevance_score) = _CONTRACTOR_FIELDS(item)
         return {
-            "content": f"Название: {item.name}\nВиды работ: {item.work_types}\nКонтактное лицо: {item.contact_person}\nКонтакты: {item.contacts}",
+            "content": f"Название: {name}\nВиды работ: {work_types}\nКонтактное лицо: {contact_person}\nКонтакты: {contacts}",
             "metadata": {
-                "website": item.website,
-                "projects": item.projects,
-                "comments": item.comments,
-                "primary_info": item.primary_info,
-                "staff_size": item.staff_size,
-                "relevance_score": item.relevance_score
+                "website": website,
+                "projects": projects,
+                "comments": comments,
+                "primary_info": primary_info,
+                "staff_size": staff_size,
+                "relevance_score": relevance_score
             }
         }
     
@@ -46,6 +55,15 @@ class AnswerGeneratorService(BaseAnswerGeneratorService):
         additional_context = kwargs.get('additional_context', '')
         return PromptBuilder.build_answer_prompt(question, items_data, additional_context)
     
+    def _empty_response_text(self, question: str, **kwargs) -> str:
+        """
+        Возвращает готовый текст ответа, когда подрядчиков не найдено.
+        
+        :param question: Вопрос пользователя
+        :return: Текст ответа
+        """
+        return "По вашему запросу не найдено подрядчиков."
+    
     def _generate_fallback_text(self, question: str, items: List[Contractor], **kwargs) -> str:
         """
         Генерирует fallback текст для подрядчиков.
@@ -57,8 +75,7 @@ class AnswerGeneratorService(BaseAnswerGeneratorService):
         fallback_text = f"По вашему запросу '{question}' найдено {len(items)} подрядчиков."
         
         if items:
-            fallback_text += "\n\n## Список подрядчиков:\n\n"
-            for i, c in enumerate(items, 1):
-                fallback_text += f"{i}. **{c.name}** - {c.work_types}\n"
+            lines = [f"{i}. **{c.name}** - {c.work_types}\n" for i, c in enumerate(items, 1)]
+            fallback_text += "\n\n## Список подрядчиков:\n\n" + "".join(lines)
         
         return fallback_text
\ No newline at end of file
@@ -7,6 +7,19 @@ from app.utils.logging import setup_logger
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Маппинг исходных названий колонок подрядчиков на внутренние (создается один раз при импорте)
+_COLUMN_MAPPING = {
+    'Наименование_КА': 'name',
+    'Виды_работ': 'work_types',
+    'Контактное_лицо': 'contact_person',
+    'Контакты': 'contacts',
+    'Сайт': 'website',
+    'Задействован_в_проекте': 'projects',
+    'Комментарий': 'comments',
+    'Первичная_информация': 'primary_info',
+    'Штат': 'staff_size'
+}
+
 
 class ContractorNormalizationService(BaseNormalizationService):
     """
@@ -19,14 +32,4 @@ class ContractorNormalizationService(BaseNormalizationService):
         
         :return: Словарь соответствия старых и новых названий колонок
         """
-        return {
-            'Наименование_КА': 'name',
-            'Виды_работ': 'work_types',
-            'Контактное_лицо': 'contact_person',
-            'Контакты': 'contacts',
-            'Сайт': 'website',
-            'Задействован_в_проекте': 'projects',
-            'Комментарий': 'comments',
-            'Первичная_информация': 'primary_info',
-            'Штат': 'staff_size'
-        }
+        return _COLUMN_MAPPING
@@ -1,5 +1,6 @@
 # app/services/error_answer_generator.py
 
+from operator import attrgetter
 from typing import List, Dict, Any
 from app.services.base_answer_generator import BaseAnswerGeneratorService
 from app.domain.models.error import Error
@@ -9,6 +10,13 @@ from app.utils.prompt_builder import PromptBuilder
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Поля ошибки для промпта (извлекаются одним вызовом)
+_ERROR_KEYS = (
+    'date', 'responsible', 'subject', 'description', 'measures',
+    'reason', 'project', 'stage', 'category', 'relevance_score'
+)
+_ERROR_FIELDS = attrgetter(*_ERROR_KEYS)
+
 
 class ErrorAnswerGeneratorService(BaseAnswerGeneratorService):
     """
@@ -22,18 +30,7 @@ class ErrorAnswerGeneratorService(BaseAnswerGeneratorService):
         :param item: Модель ошибки
         :return: Словарь с данными ошибки
         """
-        return {
-            "date": item.date,
-            "responsible": item.responsible,
-            "subject": item.subject,
-            "description": item.description,
-            "measures": item.measures,
-            "reason": item.reason,
-            "project": item.project,
-            "stage": item.stage,
-            "category": item.category,
-            "relevance_score": item.relevance_score
-        }
+        return dict(zip(_ERROR_KEYS, _ERROR_FIELDS(item)))
     
     def _get_prompts(self, question: str, items_data: List[Dict[str, Any]], **kwargs) -> Dict[str, str]:
         """
@@ -47,6 +44,15 @@ class ErrorAnswerGeneratorService(BaseAnswerGeneratorService):
         additional_context = kwargs.get('additional_context', '')
         return PromptBuilder.build_error_answer_prompt(question, items_data, additional_context)
     
+    def _empty_response_text(self, question: str, **kwargs) -> str:
+        """
+        Возвращает готовый текст ответа, когда ошибок не найдено.
+        
+        :param question: Вопрос пользователя
+        :return: Текст ответа
+        """
+        return "По вашему запросу не найдено ошибок."
+    
     def _generate_fallback_text(self, question: str, items: List[Error], **kwargs) -> str:
         """
         Генерирует fallback текст для ошибок.
@@ -58,8 +64,10 @@ class ErrorAnswerGeneratorService(BaseAnswerGeneratorService):
         fallback_text = f"По вашему запросу '{question}' найдено {len(items)} ошибок."
         
         if items:
-            fallback_text += "\n\n## Список ошибок:\n\n"
-            for i, error in enumerate(items, 1):
-                fallback_text += f"{i}. **Проект**: {error.project}\n   **Описание**: {error.description}\n\n"
+            lines = [
+                f"{i}. **Проект**: {error.project}\n   **Описание**: {error.description}\n\n"
+                for i, error in enumerate(items, 1)
+            ]
+            fallback_text += "\n\n## Список ошибок:\n\n" + "".join(lines)
         
         return fallback_text
\ No newline at end of file
@@ -1,5 +1,6 @@
 # app/services/error_normalization.py
 
+import pandas as pd
 from typing import Dict
 from app.services.base_normalization import BaseNormalizationService
 from app.utils.logging import setup_logger
@@ -7,6 +8,22 @@ from app.utils.logging import setup_logger
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Маппинг исходных названий колонок ошибок на внутренние (создается один раз при импорте)
+_COLUMN_MAPPING = {
+    'дата фиксации': 'date',
+    'ответственный': 'responsible',
+    'предмет ошибки': 'subject',
+    'описание ошибки': 'description',
+    'предпринятые меры': 'measures',
+    'причина': 'reason',
+    'проект': 'project',
+    'стадия проекта': 'stage',
+    'категория': 'category'
+}
+
+# Колонки с небольшим числом повторяющихся значений: храним их как категории
+_CATEGORICAL_COLUMNS = ('project', 'stage', 'category', 'responsible')
+
 
 class ErrorNormalizationService(BaseNormalizationService):
     """
@@ -19,14 +36,14 @@ class ErrorNormalizationService(BaseNormalizationService):
         
         :return: Словарь соответствия старых и новых названий колонок
         """
-        return {
-            'дата фиксации': 'date',
-            'ответственный': 'responsible',
-            'предмет ошибки': 'subject',
-            'описание ошибки': 'description',
-            'предпринятые меры': 'measures',
-            'причина': 'reason',
-            'проект': 'project',
-            'стадия проекта': 'stage',
-            'категория': 'category'
-        }
\ No newline at end of file
+        return _COLUMN_MAPPING
+    
+    def _additional_processing(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Переводит повторяющиеся текстовые колонки в категориальный тип:
+        уникальные значения и фильтрация по проекту работают с целочисленными кодами.
+        
+        :param df: DataFrame после базовой нормализации
+        :return: DataFrame с категориальными колонками
+        """
+        return self._to_categorical(df, _CATEGORICAL_COLUMNS)
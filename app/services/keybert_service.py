@@ -1,13 +1,19 @@
 # app/services/keybert_service.py
 
-from typing import List, Tuple
-from keybert import KeyBERT
-from sentence_transformers import SentenceTransformer
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.config import keybert_settings
 from app.utils.logging import setup_logger
 
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Токенизация кандидатов так же, как в CountVectorizer, который KeyBERT использует по умолчанию
+_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
 
 class KeyBERTService:
     """
@@ -20,18 +26,50 @@ class KeyBERTService:
         Инициализация KeyBERT сервиса с BGE-m3 моделью.
         """
         try:
-            logger.info("Инициализация KeyBERT с моделью BGE-m3...")
+            # Тяжелые библиотеки импортируются только при создании сервиса, а не при импорте модуля
+            from keybert import KeyBERT
+            from sentence_transformers import SentenceTransformer
+            
+            logger.info(f"Инициализация KeyBERT с моделью {keybert_settings.model_name}...")
             
             # Загружаем модель BGE-m3 (может быть задержка при первой загрузке)
-            self.model = SentenceTransformer("BAAI/bge-m3")
+            self.model = SentenceTransformer(keybert_settings.model_name)
+            self._quantize_model()
             self.kw_model = KeyBERT(self.model)
             
+            # Эмбеддинги слов-кандидатов, уже посчитанные моделью (LRU), чтобы не кодировать их повторно
+            self._word_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+            self._word_embeddings_lock = threading.Lock()
+            
             logger.info("KeyBERT сервис успешно инициализирован")
             
         except Exception as e:
             logger.error(f"Ошибка при инициализации KeyBERT: {e}")
             raise e
     
+    def _quantize_model(self) -> None:
+        """
+        Сжимает веса модели согласно настройке quantization: на GPU переводит модель в FP16,
+        на CPU квантует линейные слои в int8. При ошибке модель остается в FP32.
+        """
+        if keybert_settings.quantization == "none":
+            return
+        
+        try:
+            import torch
+            
+            if self.model.device.type == "cuda":
+                self.model.half()
+                logger.info("Модель KeyBERT переведена в FP16")
+            else:
+                transformer = self.model[0]
+                transformer.auto_model = torch.quantization.quantize_dynamic(
+                    transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                logger.info("Линейные слои модели KeyBERT квантованы в int8")
+        except Exception as e:
+            logger.warning(f"Не удалось сжать модель KeyBERT, используется FP32: {e}")
+    
     def extract_keywords(
         self, 
         text: str, 
@@ -46,35 +84,137 @@ class KeyBERTService:
         :param keyphrase_ngram_range: Диапазон n-грамм для ключевых фраз
         :return: Список ключевых слов, отсортированных по релевантности
         """
-        if not text or not text.strip():
+        return self.extract_keywords_batch([text], top_n, keyphrase_ngram_range)[0]
+    
+    def extract_keywords_batch(
+        self,
+        texts: List[str],
+        top_n: int = 7,
+        keyphrase_ngram_range: Tuple[int, int] = (1, 1)
+    ) -> List[List[str]]:
+        """
+        Извлекает ключевые слова сразу для нескольких текстов.
+        Все тексты кодируются моделью за один батч, а не отдельным проходом на каждый текст.
+        
+        :param texts: Список текстов для извлечения ключевых слов
+        :param top_n: Количество топ ключевых слов для каждого текста
+        :param keyphrase_ngram_range: Диапазон n-грамм для ключевых фраз
+        :return: Списки ключевых слов в порядке исходных текстов (пустой список для пустого текста или при ошибке)
+        """
+        results: List[List[str]] = [[] for _ in texts]
+        
+        # Пустые тексты в модель не отправляем
+        positions = [i for i, text in enumerate(texts) if text and text.strip()]
+        if len(positions) < len(texts):
             logger.warning("Пустой текст для извлечения ключевых слов")
-            return []
+        
+        # Если у текста кандидатов не больше top_n, KeyBERT вернул бы их все - модель не нужна
+        vocabulary: Optional[List[str]] = None
+        if keyphrase_ngram_range == (1, 1):
+            model_positions = []
+            vocabulary_words: Dict[str, None] = {}
+            for i in positions:
+                candidates = self._candidate_words(texts[i])
+                if len(candidates) <= top_n:
+                    results[i] = candidates
+                    logger.info(f"Короткий текст, ключевые слова без модели: {candidates}")
+                else:
+                    model_positions.append(i)
+                    vocabulary_words.update(dict.fromkeys(candidates))
+            positions = model_positions
+            vocabulary = list(vocabulary_words)
+        
+        if not positions:
+            return results
         
         try:
-            logger.debug(f"Извлечение ключевых слов из текста: '{text[:100]}...'")
-            
-            # Извлекаем ключевые слова с оценками
-            keywords_with_scores = self.kw_model.extract_keywords(
-                text,
-                keyphrase_ngram_range=keyphrase_ngram_range,
-                top_n=top_n
-            )
+            logger.debug(f"Извлечение ключевых слов из {len(positions)} текстов")
             
-            # Извлекаем только ключевые слова без оценок
-            keywords = [kw for kw, score in keywords_with_scores]
+            if vocabulary is not None:
+                # Словарь кандидатов и их эмбеддинги передаем сами: уже известные слова не кодируются заново
+                batch_keywords = self.kw_model.extract_keywords(
+                    [texts[i] for i in positions],
+                    candidates=vocabulary,
+                    keyphrase_ngram_range=keyphrase_ngram_range,
+                    top_n=top_n,
+                    word_embeddings=self._embed_words(vocabulary)
+                )
+            else:
+                batch_keywords = self.kw_model.extract_keywords(
+                    [texts[i] for i in positions],
+                    keyphrase_ngram_range=keyphrase_ngram_range,
+                    top_n=top_n
+                )
+            # Для одного документа KeyBERT возвращает плоский список, а не список списков
+            if len(positions) == 1:
+                batch_keywords = [batch_keywords]
             
-            logger.info(f"Извлечено {len(keywords)} ключевых слов: {keywords}")
+            debug_enabled = logger.isEnabledFor(10)  # DEBUG level
+            for position, keywords_with_scores in zip(positions, batch_keywords):
+                # Извлекаем только ключевые слова без оценок
+                results[position] = [kw for kw, score in keywords_with_scores]
+                
+                logger.info("Извлечено %d ключевых слов: %s", len(results[position]), results[position])
+                
+                # Логируем детали в debug режиме
+                if debug_enabled:
+                    for kw, score in keywords_with_scores:
+                        logger.debug(f"Ключевое слово: {kw:<20} | Оценка: {score:.3f}")
             
-            # Логируем детали в debug режиме
-            if logger.isEnabledFor(10):  # DEBUG level
-                for kw, score in keywords_with_scores:
-                    logger.debug(f"Ключевое слово: {kw:<20} | Оценка: {score:.3f}")
-            
-            return keywords
+            return results
             
         except Exception as e:
             logger.error(f"Ошибка при извлечении ключевых слов: {e}")
-            return []
+            for position in positions:
+                results[position] = []
+            return results
+    
+    def _embed_words(self, words: List[str]) -> np.ndarray:
+        """
+        Возвращает эмбеддинги слов в порядке списка, кодируя моделью только слова,
+        которых еще нет в кэше.
+        
+        :param words: Список уникальных слов
+        :return: Матрица эмбеддингов (по строке на слово)
+        """
+        with self._word_embeddings_lock:
+            missing = [word for word in words if word not in self._word_embeddings]
+        
+        if missing:
+            encoded = np.asarray(self.model.encode(missing), dtype=np.float32)
+            with self._word_embeddings_lock:
+                self._word_embeddings.update(zip(missing, encoded))
+        
+        with self._word_embeddings_lock:
+            embeddings = []
+            for word in words:
+                embedding = self._word_embeddings.get(word)
+                if embedding is None:
+                    # Слово успели вытеснить из кэша другим потоком - кодируем заново
+                    embedding = np.asarray(self.model.encode([word]), dtype=np.float32)[0]
+                    self._word_embeddings[word] = embedding
+                self._word_embeddings.move_to_end(word)
+                embeddings.append(embedding)
+            
+            while len(self._word_embeddings) > keybert_settings.word_embedding_cache_size:
+                self._word_embeddings.popitem(last=False)
+        
+        logger.debug(f"Эмбеддинги {len(words)} слов-кандидатов, закодировано новых: {len(missing)}")
+        return np.stack(embeddings)
+    
+    @staticmethod
+    def _candidate_words(text: str) -> List[str]:
+        """
+        Возвращает слова-кандидаты текста так, как их отбирает KeyBERT для униграмм:
+        нижний регистр, слова от двух символов, без английских стоп-слов, без повторов.
+        
+        :param text: Исходный текст
+        :return: Список уникальных слов в порядке появления
+        """
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        
+        words = _TOKEN_PATTERN.findall(text.lower())
+        return list(dict.fromkeys(word for word in words if word not in ENGLISH_STOP_WORDS))
     
     def extract_keywords_with_scores(
         self, 
@@ -103,7 +243,7 @@ class KeyBERTService:
                 top_n=top_n
             )
             
-            logger.info(f"Извлечено {len(keywords_with_scores)} ключевых слов с оценками")
+            logger.info("Извлечено %d ключевых слов с оценками", len(keywords_with_scores))
             
             return keywords_with_scores
             
@@ -112,15 +252,55 @@ class KeyBERTService:
             return []
 
 
-# Создаем глобальный экземпляр сервиса (singleton pattern)
-_keybert_service = None
+# Глобальный экземпляр сервиса (singleton pattern), создается в фоновом потоке
+_keybert_service: Optional[KeyBERTService] = None
+_keybert_init_error: Optional[Exception] = None
+_keybert_thread: Optional[threading.Thread] = None
+_keybert_ready = threading.Event()
+_keybert_lock = threading.Lock()
+
+
+def _initialize_keybert_service() -> None:
+    """Создает сервис и сообщает ожидающим о завершении (успешном или нет)."""
+    global _keybert_service, _keybert_init_error
+    try:
+        _keybert_service = KeyBERTService()
+    except Exception as e:
+        _keybert_init_error = e
+    finally:
+        _keybert_ready.set()
+
+
+def preload_keybert_service() -> None:
+    """
+    Запускает загрузку модели KeyBERT в фоновом потоке, не блокируя вызывающего.
+    Повторные вызовы ничего не делают.
+    """
+    global _keybert_thread
+    with _keybert_lock:
+        if _keybert_thread is None:
+            _keybert_thread = threading.Thread(
+                target=_initialize_keybert_service, name="keybert-init", daemon=True
+            )
+            _keybert_thread.start()
+
 
 def get_keybert_service() -> KeyBERTService:
     """
     Возвращает глобальный экземпляр KeyBERT сервиса.
-    Использует паттерн singleton для экономии памяти.
+    Использует паттерн singleton для экономии памяти; если модель еще загружается, ждет окончания загрузки.
     """
-    global _keybert_service
+    global _keybert_thread, _keybert_init_error
+    preload_keybert_service()
+    _keybert_ready.wait()
+    
     if _keybert_service is None:
-        _keybert_service = KeyBERTService()
-    return _keybert_service
\ No newline at end of file
+        # Загрузка не удалась - сбрасываем состояние, чтобы следующий вызов попробовал снова
+        with _keybert_lock:
+            error = _keybert_init_error
+            if _keybert_thread is not None and _keybert_ready.is_set():
+                _keybert_thread = None
+                _keybert_init_error = None
+                _keybert_ready.clear()
+        raise error or RuntimeError("KeyBERT сервис не инициализирован")
+    return _keybert_service
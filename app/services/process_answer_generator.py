@@ -1,5 +1,6 @@
 # app/services/process_answer_generator.py
 
+from operator import attrgetter
 from typing import List, Dict, Any
 from app.services.base_answer_generator import BaseAnswerGeneratorService
 from app.domain.models.process import Process
@@ -9,6 +10,10 @@ from app.utils.prompt_builder import PromptBuilder
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Поля процесса для промпта (извлекаются одним вызовом)
+_PROCESS_KEYS = ('id', 'name', 'description', 'json_file', 'text_description', 'relevance_score')
+_PROCESS_FIELDS = attrgetter(*_PROCESS_KEYS)
+
 
 class ProcessAnswerGeneratorService(BaseAnswerGeneratorService):
     """
@@ -22,14 +27,7 @@ class ProcessAnswerGeneratorService(BaseAnswerGeneratorService):
         :param item: Модель процесса
         :return: Словарь с данными процесса
         """
-        return {
-            "id": item.id,
-            "name": item.name,
-            "description": item.description,
-            "json_file": item.json_file,
-            "text_description": item.text_description,
-            "relevance_score": item.relevance_score
-        }
+        return dict(zip(_PROCESS_KEYS, _PROCESS_FIELDS(item)))
     
     def _get_prompts(self, question: str, items_data: List[Dict[str, Any]], **kwargs) -> Dict[str, str]:
         """
@@ -43,6 +41,15 @@ class ProcessAnswerGeneratorService(BaseAnswerGeneratorService):
         additional_context = kwargs.get('additional_context', '')
         return PromptBuilder.build_process_answer_prompt(question, items_data, additional_context)
     
+    def _empty_response_text(self, question: str, **kwargs) -> str:
+        """
+        Возвращает готовый текст ответа, когда бизнес-процессов не найдено.
+        
+        :param question: Вопрос пользователя
+        :return: Текст ответа
+        """
+        return "По вашему запросу не найдено бизнес-процессов."
+    
     def _generate_fallback_text(self, question: str, items: List[Process], **kwargs) -> str:
         """
         Генерирует fallback текст для процессов.
@@ -54,8 +61,10 @@ class ProcessAnswerGeneratorService(BaseAnswerGeneratorService):
         fallback_text = f"По вашему запросу '{question}' найдено {len(items)} бизнес-процессов."
         
         if items:
-            fallback_text += "\n\n## Список бизнес-процессов:\n\n"
-            for i, process in enumerate(items, 1):
-                fallback_text += f"{i}. **{process.name}**\n   {process.description}\n\n"
+            lines = [
+                f"{i}. **{process.name}**\n   {process.description}\n\n"
+                for i, process in enumerate(items, 1)
+            ]
+            fallback_text += "\n\n## Список бизнес-процессов:\n\n" + "".join(lines)
         
         return fallback_text
\ No newline at end of file
@@ -14,6 +14,9 @@ class ProcessClassifierService(BaseClassifierService):
     Использует единую конфигурацию классификации.
     """
     
+    # Длинный список процессов классифицируется по частям параллельными запросами
+    CLASSIFICATION_CHUNK_SIZE = 25
+    
     def __init__(self, llm_client: LLMClient):
         """
         Инициализация сервиса классификации процессов.
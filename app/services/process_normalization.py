@@ -1,5 +1,6 @@
 # app/services/process_normalization.py
 
+import pandas as pd
 from typing import Dict
 from app.services.base_normalization import BaseNormalizationService
 from app.utils.logging import setup_logger
@@ -7,6 +8,18 @@ from app.utils.logging import setup_logger
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Маппинг исходных названий колонок бизнес-процессов на внутренние (создается один раз при импорте)
+_COLUMN_MAPPING = {
+    'ID': 'id',
+    'Название процесса': 'name',
+    'Описание': 'description',
+    'Файл JSON': 'json_file',
+    'Текстовое описание': 'text_description'
+}
+
+# Колонки с небольшим числом повторяющихся значений: храним их как категории
+_CATEGORICAL_COLUMNS = ('name',)
+
 
 class ProcessNormalizationService(BaseNormalizationService):
     """
@@ -19,10 +32,13 @@ class ProcessNormalizationService(BaseNormalizationService):
         
         :return: Словарь соответствия старых и новых названий колонок
         """
-        return {
-            'ID': 'id',
-            'Название процесса': 'name',
-            'Описание': 'description',
-            'Файл JSON': 'json_file',
-            'Текстовое описание': 'text_description'
-        }
\ No newline at end of file
+        return _COLUMN_MAPPING
+    
+    def _additional_processing(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Переводит название процесса в категориальный тип.
+        
+        :param df: DataFrame после базовой нормализации
+        :return: DataFrame с категориальными колонками
+        """
+        return self._to_categorical(df, _CATEGORICAL_COLUMNS)
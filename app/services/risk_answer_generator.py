@@ -1,6 +1,7 @@
 # app/services/risk_answer_generator.py
 
-from typing import List, Dict, Any
+from operator import attrgetter
+from typing import List, Dict, Any, Iterator
 from app.services.base_answer_generator import BaseAnswerGeneratorService
 from app.domain.models.risk import Risk
 from app.domain.models.answer import Answer
@@ -10,6 +11,18 @@ from app.utils.prompt_builder import PromptBuilder
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Ключи риска в промпте и соответствующие поля модели (извлекаются одним вызовом)
+_RISK_KEYS = (
+    "project_name", "Исходный_текст_риска", "risk_priority", "status",
+    "Меры_которые_требуется_предпринять_к_целевому_риску",
+    "project_id", "project_type", "relevance_score"
+)
+_RISK_FIELDS = attrgetter(
+    'project_name', 'risk_text', 'risk_priority', 'status',
+    'measures',
+    'project_id', 'project_type', 'relevance_score'
+)
+
 
 class RiskAnswerGeneratorService(BaseAnswerGeneratorService):
     """
@@ -23,16 +36,7 @@ class RiskAnswerGeneratorService(BaseAnswerGeneratorService):
         :param item: Модель риска
         :return: Словарь с данными риска
         """
-        return {
-            "project_name": item.project_name,
-            "Исходный_текст_риска": item.risk_text,
-            "risk_priority": item.risk_priority,
-            "status": item.status,
-            "Меры_которые_требуется_предпринять_к_целевому_риску": item.measures,  # <--- ДОБАВЛЕНО
-            "project_id": item.project_id,
-            "project_type": item.project_type,
-            "relevance_score": item.relevance_score
-        }
+        return dict(zip(_RISK_KEYS, _RISK_FIELDS(item)))
     
     def _get_prompts(self, question: str, items_data: List[Dict[str, Any]], **kwargs) -> Dict[str, str]:
         """
@@ -47,6 +51,15 @@ class RiskAnswerGeneratorService(BaseAnswerGeneratorService):
         additional_context = kwargs.get('additional_context', '')
         return PromptBuilder.build_risk_answer_prompt(question, items_data, category, additional_context)
     
+    def _empty_response_text(self, question: str, **kwargs) -> str:
+        """
+        Возвращает готовый текст ответа, когда рисков не найдено.
+        
+        :param question: Вопрос пользователя
+        :return: Текст ответа
+        """
+        return "По вашему запросу не найдено рисков."
+    
     def _generate_fallback_text(self, question: str, items: List[Risk], **kwargs) -> str:
         """
         Генерирует fallback текст для рисков.
@@ -60,9 +73,11 @@ class RiskAnswerGeneratorService(BaseAnswerGeneratorService):
         fallback_text = f"По вашему запросу '{question}' в категории '{category}' найдено {len(items)} рисков."
         
         if items:
-            fallback_text += "\n\n## Список рисков:\n\n"
-            for i, risk in enumerate(items, 1):
-                fallback_text += f"{i}. **Проект**: {risk.project_name}\n   **Риск**: {risk.risk_text}\n\n"
+            lines = [
+                f"{i}. **Проект**: {risk.project_name}\n   **Риск**: {risk.risk_text}\n\n"
+                for i, risk in enumerate(items, 1)
+            ]
+            fallback_text += "\n\n## Список рисков:\n\n" + "".join(lines)
         
         return fallback_text
     
@@ -76,4 +91,26 @@ class RiskAnswerGeneratorService(BaseAnswerGeneratorService):
         :param additional_context: Дополнительный контекст
         :return: Модель Answer
         """
-        return super().make_md(question, risks, additional_context=additional_context, category=category)
\ No newline at end of file
+        return super().make_md(question, risks, additional_context=additional_context, category=category)
+    
+    def make_answer_stream(
+        self,
+        question: str,
+        risks: List[Risk],
+        category: str,
+        additional_context: str = "",
+        update_every: int = 8
+    ) -> Iterator[Answer]:
+        """
+        Потоковая генерация ответа о рисках с промежуточными моделями Answer.
+        
+        :param question: Вопрос пользователя
+        :param risks: Список рисков
+        :param category: Категория риска
+        :param additional_context: Дополнительный контекст
+        :param update_every: Через сколько фрагментов LLM отдавать очередной промежуточный ответ
+        :return: Итератор моделей Answer
+        """
+        return super().make_answer_stream(
+            question, risks, additional_context=additional_context, update_every=update_every, category=category
+        )
@@ -9,6 +9,24 @@ from app.utils.logging import setup_logger
 # Настройка логгера
 logger = setup_logger(__name__)
 
+# Маппинг исходных названий колонок рисков на внутренние (создается один раз при импорте)
+_COLUMN_MAPPING = {
+    '№ проекта': 'project_id',
+    'Тип проекта': 'project_type',
+    'Наименование проекта': 'project_name',
+    'Риск': 'risk_json',
+    'Приоритетность': 'risk_priority',
+    'Текущий статус': 'status',
+    'Вероятность': 'probability',
+    'Серьезность последствий': 'severity',
+    'Предлагаемые меры': 'measures'
+}
+
+# Колонки с небольшим числом повторяющихся значений: храним их как категории.
+# project_type сюда не входит: его сравнивают с RiskCategory, а str-Enum хешируется
+# не как строка, поэтому поиск такого значения среди категорий не сработал бы
+_CATEGORICAL_COLUMNS = ('project_name', 'risk_priority', 'status')
+
 
 class RiskNormalizationService(BaseNormalizationService):
     """
@@ -21,30 +39,24 @@ class RiskNormalizationService(BaseNormalizationService):
         
         :return: Словарь соответствия старых и новых названий колонок
         """
-        return {
-            '№ проекта': 'project_id',
-            'Тип проекта': 'project_type',
-            'Наименование проекта': 'project_name',
-            'Риск': 'risk_json',
-            'Приоритетность': 'risk_priority',
-            'Текущий статус': 'status',
-            'Вероятность': 'probability',
-            'Серьезность последствий': 'severity',
-            'Предлагаемые меры': 'measures'
-        }
+        return _COLUMN_MAPPING
     
     def _additional_processing(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Дополнительная обработка для извлечения текста риска из JSON.
+        Дополнительная обработка: извлечение текста риска из JSON и перевод
+        повторяющихся колонок в категориальный тип.
         
         :param df: DataFrame после базовой нормализации
         :return: DataFrame с добавленной колонкой risk_text
         """
-        # Экстрагируем текст риска из JSON
+        # Экстрагируем текст риска из JSON: каждая уникальная строка разбирается один раз
+        # (одинаковые JSON-шаблоны в реестре рисков повторяются), строки получают результат по словарю
         if 'risk_json' in df.columns:
-            df['risk_text'] = df['risk_json'].apply(self._extract_risk_text)
+            risk_jsons = df['risk_json'].to_numpy()
+            extracted = {risk_json: self._extract_risk_text(risk_json) for risk_json in pd.unique(risk_jsons)}
+            df['risk_text'] = [extracted[risk_json] for risk_json in risk_jsons]
         
-        return df
+        return self._to_categorical(df, _CATEGORICAL_COLUMNS)
     
     def _extract_risk_text(self, risk_json: str) -> str:
         """
@@ -55,8 +67,12 @@ class RiskNormalizationService(BaseNormalizationService):
         """
         try:
             risk_data = json.loads(risk_json)
-            # Возвращаем значение ключа "original" или пустую строку
-            return risk_data.get("original", "")
         except (json.JSONDecodeError, TypeError):
             # В случае ошибки возвращаем исходный текст
-            return str(risk_json)
\ No newline at end of file
+            return str(risk_json)
+        
+        # Возвращаем значение ключа "original" или пустую строку;
+        # валидный JSON, но не объект (например, число) - это обычный текст
+        if isinstance(risk_data, dict):
+            return risk_data.get("original", "")
+        return str(risk_json)
\ No newline at end of file
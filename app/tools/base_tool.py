@@ -1,8 +1,9 @@
 # app/tools/base_tool.py
 
+import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Tuple
+from typing import Iterable, Dict, Any, Tuple
 from app.utils.logging import setup_logger
 
 # Настройка логгера
@@ -36,42 +37,76 @@ class BaseTool(ABC):
         pass
 
 
-def calculate_relevance_score(text: str, keywords: List[str], enable_detailed_logging: bool = False) -> float:
+def normalize_keywords(keywords: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Приводит ключевые слова к виду для сравнения: нижний регистр, без пробелов по краям, без пустых.
+    Вызывается один раз на набор ключевых слов, а не для каждого текста.
+    
+    :param keywords: Список ключевых слов
+    :return: Кортеж нормализованных ключевых слов
+    """
+    return tuple(keyword for keyword in (kw.lower().strip() for kw in keywords) if keyword)
+
+
+def calculate_relevance_score(text: str, keywords: Iterable[str], enable_detailed_logging: bool = False) -> float:
     """
     Вычисляет оценку релевантности текста на основе ключевых слов.
-    Базовая реализация - количество найденных ключевых слов.
+    Базовая реализация - доля найденных ключевых слов.
+    Для целой колонки текстов быстрее count_keyword_hits.
     
     :param text: Текст для анализа
-    :param keywords: Список ключевых слов
+    :param keywords: Список ключевых слов (в любом регистре, нормализуются здесь)
     :param enable_detailed_logging: Включить детальное логирование совпадений
     :return: Оценка релевантности (0.0 - 1.0)
     """
-    if not text or not keywords:
+    norm_keywords = normalize_keywords(keywords)
+    if not text or not norm_keywords:
         return 0.0
     
     text_lower = str(text).lower()
-    matches = 0
-    matched_keywords = []
-    unmatched_keywords = []
-    
-    for keyword in keywords:
-        keyword_lower = keyword.lower().strip()
-        if keyword_lower and keyword_lower in text_lower:
-            matches += 1
-            matched_keywords.append(keyword)
-        else:
-            unmatched_keywords.append(keyword)
     
     # Детальное логирование, если включено
     if enable_detailed_logging and logger.isEnabledFor(20):  # INFO level
-        score = matches / len(keywords) if keywords else 0.0
+        matched_keywords = [keyword for keyword in norm_keywords if keyword in text_lower]
+        unmatched_keywords = [keyword for keyword in norm_keywords if keyword not in text_lower]
+        score = len(matched_keywords) / len(norm_keywords)
         text_preview = text[:100] + ("..." if len(text) > 100 else "")
         
         logger.info(" Анализ релевантности:")
         logger.info(f"   📝 Текст: '{text_preview}'")
-        logger.info(f"   ✅ Найденные слова ({matches}/{len(keywords)}): {matched_keywords}")
+        logger.info(f"   ✅ Найденные слова ({len(matched_keywords)}/{len(norm_keywords)}): {matched_keywords}")
         logger.info(f"   ❌ Не найденные слова: {unmatched_keywords}")
         logger.info(f"   📊 Оценка релевантности: {score:.3f}")
+        return score
     
     # Нормализуем по количеству ключевых слов
-    return matches / len(keywords) if keywords else 0.0
\ No newline at end of file
+    return sum(keyword in text_lower for keyword in norm_keywords) / len(norm_keywords)
+
+
+def count_keyword_hits(texts: pd.Series, norm_keywords: Tuple[str, ...]) -> np.ndarray:
+    """
+    Считает, сколько ключевых слов встречается в каждом тексте колонки:
+    один проход str.contains по колонке на каждое ключевое слово.
+    Счетчики компактные (int8, если ключевых слов меньше 128), нормализовать их
+    до оценки можно только для отобранных строк.
+    
+    :param texts: Колонка текстов
+    :param norm_keywords: Ключевые слова, подготовленные normalize_keywords
+    :return: Массив количеств найденных ключевых слов в порядке строк
+    """
+    dtype = np.int8 if len(norm_keywords) <= np.iinfo(np.int8).max else np.int32
+    if not norm_keywords or texts.empty:
+        return np.zeros(len(texts), dtype=dtype)
+    
+    texts_lower = texts.fillna('').astype(str).str.lower()
+    hits = np.zeros(len(texts_lower), dtype=dtype)
+    for keyword in norm_keywords:
+        hits += texts_lower.str.contains(keyword, regex=False).to_numpy(dtype=dtype)
+    
+    if logger.isEnabledFor(20):  # INFO level
+        logger.info(
+            f"Анализ релевантности: {len(texts_lower)} текстов, {len(norm_keywords)} ключевых слов, "
+            f"совпадения найдены в {int(np.count_nonzero(hits))} текстах"
+        )
+    return hits
+
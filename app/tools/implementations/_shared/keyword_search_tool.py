@@ -1,17 +1,121 @@
 # app/tools/keyword_search_tool.py
 
+import numpy as np
 import pandas as pd
-import pymorphy3
+import multiprocessing
+import os
 import re
-from typing import List, Dict, Any, Tuple
-from app.tools.base_tool import BaseTool, calculate_relevance_score
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+from app.tools.base_tool import BaseTool, count_keyword_hits, normalize_keywords
 from app.utils.logging import setup_logger
 
 # Настройка логгера
 logger = setup_logger(__name__)
 
-# Инициализация pymorphy2.MorphAnalyzer один раз для производительности
-morph = pymorphy3.MorphAnalyzer()
+# Слова текста после приведения к нижнему регистру (все прочие символы - разделители)
+_TOKEN_RE = re.compile(r'[а-яa-z0-9]+')
+
+
+@lru_cache(maxsize=1)
+def get_morph():
+    """
+    Возвращает общий MorphAnalyzer. Словари pymorphy3 загружаются при первой лемматизации,
+    а не при импорте модуля, и только один раз на процесс.
+
+    :return: Экземпляр pymorphy3.MorphAnalyzer
+    """
+    import pymorphy3
+    logger.info("Загрузка словарей pymorphy3")
+    return pymorphy3.MorphAnalyzer()
+
+
+# Леммы уже разобранных слов. Обычный словарь, а не lru_cache: параллельная лемматизация
+# проверяет, каких слов в нем нет, и добавляет в него результаты дочерних процессов
+_LEMMAS: Dict[str, str] = {}
+_LEMMAS_MAX_SIZE = 200_000
+
+
+def _remember_lemmas(lemmas: Dict[str, str]) -> None:
+    """
+    Добавляет леммы в кэш; при переполнении кэш начинается заново.
+
+    :param lemmas: Словарь {слово: лемма}
+    """
+    if len(_LEMMAS) + len(lemmas) > _LEMMAS_MAX_SIZE:
+        _LEMMAS.clear()
+    _LEMMAS.update(lemmas)
+
+
+def _lemma(word: str) -> str:
+    """
+    Возвращает нормальную форму слова. Слова в текстах рисков часто повторяются,
+    поэтому разбор pymorphy3 для каждого слова выполняется один раз.
+
+    :param word: Слово в нижнем регистре
+    :return: Лемма слова
+    """
+    lemma = _LEMMAS.get(word)
+    if lemma is None:
+        lemma = get_morph().parse(word)[0].normal_form
+        _remember_lemmas({word: lemma})
+    return lemma
+
+
+def _lemmatize_words(words: List[str]) -> List[str]:
+    """
+    Лемматизирует пачку слов. Выполняется в дочернем процессе: анализатор создается
+    в нем самом через get_morph() один раз на все время жизни процесса, а не передается через pickle.
+
+    :param words: Слова в нижнем регистре
+    :return: Леммы в том же порядке
+    """
+    return [_lemma(word) for word in words]
+
+
+# Количество еще не разобранных слов, начиная с которого лемматизация распределяется по процессам:
+# на меньших объемах передача слов между процессами дороже самой работы
+_PARALLEL_MIN_WORDS = 20_000
+_PARALLEL_MAX_WORKERS = 8
+
+# Пул процессов для лемматизации создается при первой необходимости и живет до конца работы приложения,
+# поэтому словари pymorphy3 загружаются в каждом дочернем процессе только один раз
+_lemmatize_pool: Optional[ProcessPoolExecutor] = None
+_lemmatize_pool_lock = threading.Lock()
+
+
+def _get_lemmatize_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Возвращает общий пул процессов для лемматизации, создавая его при первом вызове.
+
+    :param workers: Количество процессов
+    :return: Экземпляр ProcessPoolExecutor
+    """
+    global _lemmatize_pool
+    with _lemmatize_pool_lock:
+        if _lemmatize_pool is None:
+            # spawn: приложение многопоточное, fork такого процесса может унаследовать захваченные блокировки
+            _lemmatize_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _lemmatize_pool
+
+
+def _reset_lemmatize_pool() -> None:
+    """Останавливает неисправный пул, чтобы следующий вызов создал новый."""
+    global _lemmatize_pool
+    with _lemmatize_pool_lock:
+        if _lemmatize_pool is not None:
+            _lemmatize_pool.shutdown(wait=False, cancel_futures=True)
+            _lemmatize_pool = None
+
+# Лемматизированные колонки уже обработанных данных: (колонка, длина, контрольная сумма колонки с индексом) -> Series.
+# Ключ зависит только от содержимого, поэтому новый срез тех же данных на каждый запрос попадает в кэш
+_LEMMA_CACHE: "OrderedDict[Tuple[str, int, int], pd.Series]" = OrderedDict()
+_LEMMA_CACHE_SIZE = 8
+_LEMMA_CACHE_LOCK = threading.Lock()
+
 
 class KeywordSearchTool(BaseTool):
     """
@@ -25,12 +129,97 @@ class KeywordSearchTool(BaseTool):
         """
         if not isinstance(text, str):
             return ""
-        text = text.lower()
-        # Удаляем все, кроме букв, цифр и пробелов
-        text = re.sub(r'[^а-яА-Яa-zA-Z0-9\s]', ' ', text)
-        words = text.split()
-        lemmatized_words = [morph.parse(word)[0].normal_form for word in words]
-        return " ".join(lemmatized_words)
+        return " ".join([_lemma(word) for word in _TOKEN_RE.findall(text.lower())])
+
+    def _lemmatize_column(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """
+        Лемматизирует колонку DataFrame. Результат запоминается, поэтому повторные запросы
+        к тем же данным не лемматизируют корпус заново.
+
+        :param df: DataFrame с данными
+        :param column: Название колонки для лемматизации
+        :return: Series лемматизированных текстов с индексом исходного DataFrame
+        """
+        checksum = int(pd.util.hash_pandas_object(df[column], index=True).sum())
+        key = (column, len(df), checksum)
+
+        with _LEMMA_CACHE_LOCK:
+            cached = _LEMMA_CACHE.get(key)
+            if cached is not None:
+                _LEMMA_CACHE.move_to_end(key)
+                logger.debug("Лемматизированная колонка '%s' взята из кэша", column)
+                return cached
+
+        # Сначала токенизируем весь корпус и лемматизируем каждое уникальное слово один раз,
+        # затем собираем тексты по готовому словарю лемм
+        tokenized = [
+            _TOKEN_RE.findall(text.lower()) if isinstance(text, str) else []
+            for text in df[column].to_numpy()
+        ]
+        vocabulary = list(set().union(*tokenized))
+        lemma_map = dict(zip(vocabulary, self._lemmatize_vocabulary(vocabulary)))
+        lemmatized = pd.Series(
+            [" ".join([lemma_map[word] for word in words]) for words in tokenized],
+            index=df.index,
+            dtype=object
+        )
+
+        with _LEMMA_CACHE_LOCK:
+            _LEMMA_CACHE[key] = lemmatized
+            if len(_LEMMA_CACHE) > _LEMMA_CACHE_SIZE:
+                _LEMMA_CACHE.popitem(last=False)
+        return lemmatized
+
+    @staticmethod
+    def _lemmatize_vocabulary(vocabulary: List[str]) -> List[str]:
+        """
+        Лемматизирует уникальные слова корпуса. Если еще не разобранных слов много, они делятся
+        на части и обрабатываются в общем пуле процессов, так как разбор pymorphy3 упирается в GIL;
+        результаты добавляются в кэш лемм текущего процесса.
+
+        :param vocabulary: Уникальные слова в нижнем регистре
+        :return: Леммы в том же порядке
+        """
+        missing = [word for word in vocabulary if word not in _LEMMAS]
+        workers = min(os.cpu_count() or 1, _PARALLEL_MAX_WORKERS)
+        if len(missing) >= _PARALLEL_MIN_WORDS and workers >= 2:
+            chunk_size = -(-len(missing) // workers)
+            chunks = [missing[start:start + chunk_size] for start in range(0, len(missing), chunk_size)]
+            logger.info("Параллельная лемматизация %d слов в %d процессах", len(missing), len(chunks))
+            try:
+                pool = _get_lemmatize_pool(workers)
+                lemmas = [lemma for chunk_lemmas in pool.map(_lemmatize_words, chunks) for lemma in chunk_lemmas]
+                parsed = dict(zip(missing, lemmas))
+                _remember_lemmas(parsed)
+                return [parsed.get(word) or _lemma(word) for word in vocabulary]
+            except Exception as e:
+                logger.warning(f"Параллельная лемматизация недоступна, выполняем в текущем процессе: {e}")
+                _reset_lemmatize_pool()
+        return _lemmatize_words(vocabulary)
+
+    @staticmethod
+    def _top_positions(relevance: np.ndarray, positions: np.ndarray, top_n: int) -> np.ndarray:
+        """
+        Выбирает top_n позиций с наибольшей релевантностью за линейное время (np.partition)
+        и сортирует только отобранные. Порядок совпадает с nlargest(keep='first'):
+        при равных оценках выигрывает строка, идущая раньше.
+
+        :param relevance: Оценки релевантности (или счетчики совпадений) всех строк
+        :param positions: Возрастающие позиции строк с ненулевой релевантностью
+        :param top_n: Количество позиций для возврата
+        :return: Позиции строк в порядке убывания релевантности
+        """
+        if top_n <= 0:
+            return positions[:0]
+        values = relevance[positions]
+        if positions.size > top_n:
+            # Оценка top_n-го по величине элемента: все, что выше, берем целиком, равные ей - по порядку строк
+            kth = np.partition(values, positions.size - top_n)[positions.size - top_n]
+            above = values > kth
+            ties = np.flatnonzero(values == kth)[:top_n - int(above.sum())]
+            keep = np.sort(np.concatenate([np.flatnonzero(above), ties]))
+            positions, values = positions[keep], values[keep]
+        return positions[np.argsort(-values, kind='stable')]
 
     def get_schema(self) -> Dict[str, Any]:
         """
@@ -87,31 +276,29 @@ class KeywordSearchTool(BaseTool):
         else:
             logger.info(f"KeywordSearchTool: Лемматизированные ключевые слова: {lemmatized_keywords}")
 
-        # Лемматизация колонки для поиска
-        lemmatized_column_name = f"lemmatized_{column_to_search}"
-        df_with_scores = df.copy()
-        df_with_scores[lemmatized_column_name] = df_with_scores[column_to_search].apply(self._lemmatize_text)
+        # Лемматизация колонки для поиска (отдельная Series, без копирования DataFrame)
+        lemmatized = self._lemmatize_column(df, column_to_search)
 
-        logger.info(f"Поиск по лемматизированным ключевым словам в лемматизированной колонке '{lemmatized_column_name}'.")
+        logger.info(f"Поиск по лемматизированным ключевым словам в лемматизированной колонке '{column_to_search}'.")
 
         # Расчет релевантности на основе лемматизированных данных
         logger.info("Начинаем расчет релевантности для найденных записей...")
-        df_with_scores['keyword_relevance_score'] = df_with_scores[lemmatized_column_name].apply(
-            lambda text: calculate_relevance_score(text, lemmatized_keywords, enable_detailed_logging=True)
-        )
+        norm_keywords = normalize_keywords(lemmatized_keywords)
+        # Отбор ведем по целочисленным счетчикам совпадений, в оценки переводим только топ
+        hits = count_keyword_hits(lemmatized, norm_keywords)
 
-        filtered_df = df_with_scores[df_with_scores['keyword_relevance_score'] > 0]
+        matched_positions = np.flatnonzero(hits)
 
-        if filtered_df.empty:
+        if matched_positions.size == 0:
             logger.warning("KeywordSearchTool: Не найдено совпадений после лемматизации.")
             return df.head(top_n), {}
 
-        result_df = filtered_df.nlargest(top_n, 'keyword_relevance_score')
+        top_positions = self._top_positions(hits, matched_positions, top_n)
 
         # Создаем словарь с оценками релевантности
-        scores = pd.Series(result_df.keyword_relevance_score, index=result_df.index).to_dict()
+        scores = dict(zip(df.index[top_positions], (hits[top_positions] / len(norm_keywords)).tolist()))
 
-        logger.info(f"KeywordSearchTool: Найдено {len(filtered_df)} совпадений, возвращаем топ {len(result_df)}.")
+        logger.info(f"KeywordSearchTool: Найдено {matched_positions.size} совпадений, возвращаем топ {top_positions.size}.")
 
         # Возвращаем оригинальные данные, без временных колонок
-        return df.loc[result_df.index], scores
\ No newline at end of file
+        return df.iloc[top_positions], scores
@@ -1,5 +1,6 @@
 # app/tools/registry.py
 
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from app.tools.base_tool import BaseTool
 from app.tools.implementations._shared.keyword_search_tool import KeywordSearchTool
@@ -16,6 +17,8 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
+        # Схемы инструментов статичны, поэтому строятся один раз при регистрации
+        self._schemas: Dict[str, Dict[str, Any]] = {}
         self._register_tools()
     
     def _register_tools(self):
@@ -42,6 +45,7 @@ class ToolRegistry:
             logger.warning(f"Инструмент с именем '{tool_name}' уже зарегистрирован. Перезапись.")
             
         self._tools[tool_name] = tool
+        self._schemas[tool_name] = schema
         logger.info(f"Инструмент '{tool_name}' успешно зарегистрирован.")
 
     def get_tool(self, name: str) -> Optional[BaseTool]:
@@ -59,7 +63,7 @@ class ToolRegistry:
         
         :return: Список словарей со схемами.
         """
-        return [tool.get_schema() for tool in self._tools.values()]
+        return list(self._schemas.values())
 
     def get_schemas_by_names(self, names: List[str]) -> List[Dict[str, Any]]:
         """
@@ -76,14 +80,11 @@ class ToolRegistry:
             logger.warning("Передан пустой список имен инструментов")
             return []
         
-        schemas = []
-        for name in names:
-            tool = self._tools.get(name)
-            if tool:
-                schemas.append(tool.get_schema())
-                logger.debug(f"Добавлена схема для инструмента '{name}'")
-            else:
-                logger.warning(f"Инструмент '{name}' не найден в реестре")
+        schemas = [self._schemas[name] for name in names if name in self._schemas]
+        if len(schemas) != len(names):
+            for name in names:
+                if name not in self._schemas:
+                    logger.warning(f"Инструмент '{name}' не найден в реестре")
         
         logger.info(f"Возвращено {len(schemas)} схем из {len(names)} запрошенных")
         return schemas
@@ -98,5 +99,12 @@ class ToolRegistry:
         return list(self._tools.keys())
 
 
-# Создаем единый экземпляр реестра для всего приложения
-tool_registry = ToolRegistry()
+@lru_cache(maxsize=1)
+def get_tool_registry() -> ToolRegistry:
+    """
+    Возвращает единый экземпляр реестра для всего приложения.
+    Реестр создается при первом обращении, а не при импорте модуля.
+    
+    :return: Экземпляр ToolRegistry
+    """
+    return ToolRegistry()
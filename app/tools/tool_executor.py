@@ -2,10 +2,10 @@
 
 import json
 import pandas as pd
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 from app.adapters.llm_client import LLMClient
-from app.tools.registry import tool_registry, ToolRegistry
-from app.services.keybert_service import get_keybert_service
+from app.tools.registry import get_tool_registry, ToolRegistry
+from app.services.keybert_service import KeyBERTService, get_keybert_service, preload_keybert_service
 from app.utils.logging import setup_logger
 from app.config import smart_filtering_settings
 from app.domain.enums import ButtonType
@@ -20,10 +20,16 @@ class ToolExecutor:
     на основе конфигурации для конкретного пайплайна.
     """
     
-    def __init__(self, llm_client: LLMClient, registry: ToolRegistry = tool_registry):
+    def __init__(self, llm_client: LLMClient, registry: Optional[ToolRegistry] = None):
         self.llm_client = llm_client
-        self.registry = registry
-        self.keybert_service = get_keybert_service()
+        self.registry = registry if registry is not None else get_tool_registry()
+        # Модель загружается в фоне, чтобы создание пайплайнов и первый запрос не ждали ее целиком
+        preload_keybert_service()
+    
+    @property
+    def keybert_service(self) -> KeyBERTService:
+        """KeyBERT сервис; при первом обращении дожидается окончания фоновой загрузки модели."""
+        return get_keybert_service()
 
     def apply_smart_filtering(self, question: str, df: pd.DataFrame, button_type: ButtonType, **kwargs) -> Tuple[pd.DataFrame, Dict[int, float]]:
         """
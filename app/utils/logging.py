@@ -9,6 +9,7 @@ from pathlib import Path
 from logging.handlers import RotatingFileHandler
 from typing import Optional
 from contextvars import ContextVar
+from functools import lru_cache
 
 LOG_DIR = Path(__file__).resolve().parent.parent.parent / "LOGS"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -245,6 +246,15 @@ class PipelineLogger:
         """
         self.logger.error(f"[ШАГ {step_num} ОШИБКА] {step_name}: {error_msg}")
     
+    @property
+    def is_detail_enabled(self) -> bool:
+        """
+        Включено ли детальное логирование (DEBUG режим).
+        Позволяет не формировать дорогие сообщения, которые все равно не попадут в лог.
+        """
+        from app.config import app_settings
+        return app_settings.debug
+    
     def log_detail(self, message: str, level: str = "INFO"):
         """
         Логирует детальную информацию (только в DEBUG режиме).
@@ -252,9 +262,7 @@ class PipelineLogger:
         :param message: Сообщение для логирования
         :param level: Уровень логирования (INFO, DEBUG, WARNING, ERROR)
         """
-        from app.config import app_settings
-        
-        if not app_settings.debug:
+        if not self.is_detail_enabled:
             return  # В PROD режиме детали не логируем
             
         # Используем глобальный pipeline_id если локальный не установлен
@@ -303,6 +311,19 @@ class PipelineLogger:
             
         self.log_detail(f"=== END {prompt_type.upper()} ===")
 
+    def log_response(self, prompt_type: str, response: str):
+        """
+        Логирует только ответ LLM одной записью (промпты уже залогированы ранее).
+        
+        :param prompt_type: Тип промпта (classification, answer_generation)
+        :param response: Ответ от LLM
+        """
+        if not self.is_detail_enabled or not response:
+            return
+        
+        header = prompt_type.upper()
+        self.log_detail(f"=== {header} ОТВЕТ ===\nLLM RESPONSE:\n{response}\n=== END {header} ===")
+
     def log_answer_summary(self, text: str, total_found: int):
         """
         Пишет короткое резюме ответа в саммари-лог (обрезанный текст ответа).
@@ -324,3 +345,16 @@ def get_pipeline_logger(name: str) -> PipelineLogger:
     :return: Экземпляр PipelineLogger
     """
     return PipelineLogger(name)
+
+
+@lru_cache(maxsize=None)
+def get_shared_pipeline_logger(name: str) -> PipelineLogger:
+    """
+    Возвращает логгер пайплайна, общий для всех вызовов с этим именем (один экземпляр на класс сервиса).
+    Подходит для сервисов, которые не открывают собственных блоков пайплайна; сами пайплайны
+    хранят в логгере состояние блока и получают отдельный экземпляр через get_pipeline_logger.
+    
+    :param name: Имя логгера (обычно имя класса)
+    :return: Экземпляр PipelineLogger
+    """
+    return get_pipeline_logger(name)
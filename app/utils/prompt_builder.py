@@ -25,45 +25,53 @@ class PromptBuilder:
     def build_classification_prompt(
         question: str, 
         items: List[str], 
-        item_type: str = "проект"
+        item_type: str = "проект",
+        system_prompt: str = None,
+        instructions: str = None
     ) -> Dict[str, str]:
         """
         Строит универсальные промпты для классификации запроса.
+        Вопрос ставится в самый конец пользовательского промпта: все, что перед ним, одинаково
+        для всех запросов к одному списку и попадает в кэш промптов на стороне провайдера.
         
         :param question: Вопрос пользователя
         :param items: Список элементов для классификации
         :param item_type: Тип элементов (проект, процесс и т.д.)
+        :param system_prompt: Готовый системный промпт для этих items (если уже построен)
+        :param instructions: Готовая статическая часть пользовательского промпта (если уже построена)
         :return: Словарь с ключами 'system' и 'user' для промптов
         """
-        # Системный промпт
-        system_prompt = f"""Ты эксперт по классификации запросов.
-        
-        Твоя задача: определить, к какому {item_type} из предоставленного списка наиболее релевантен запрос пользователя.
+        if system_prompt is None:
+            system_prompt = PromptBuilder.build_classification_system_prompt(items, item_type)
+        if instructions is None:
+            instructions = PromptBuilder.build_classification_instructions(items, item_type)
         
-        Список возможных {item_type}ов:
-        <start_enums> {', '.join(items)} </finish_enums>
-        
-        ВАЖНАЯ ИНФОРМАЦИЯ О ХЕШТЕГ-РАЗДЕЛИТЕЛЯХ:
-        - Каждый элемент в списке обрамлен символами # (например: #Название проекта#)
-        - Хештеги служат разделителями сущностей для точной идентификации
-        - При выборе элемента ОБЯЗАТЕЛЬНО сохраняй хештеги в точности как показано в списке
-        - Хештеги помогают избежать путаницы между похожими названиями
+        # Не подставлять вопрос в статическую часть - иначе общий префикс промпта перестанет совпадать
+        user_prompt = f"""{instructions}
+        Запрос пользователя: "{question}"
+        """
         
-        Проанализируй запрос и выполни следующие действия:
-        1. Проведи краткое рассуждение о том, к каким {item_type}ам может относиться запрос
-        2. Определи топ-3 наиболее релевантных {item_type}а и дай им оценки от 0 до 1
+        prompts = {
+            'system': system_prompt,
+            'user': user_prompt
+        }
         
-        Важно: выбирай только из предоставленного списка {item_type}ов, не добавляй свои варианты.
-        КРИТИЧЕСКИ ВАЖНО: Используй ТОЧНО такие же названия как в списке, ВКЛЮЧАЯ хештег-разделители (#название#)!
+        return prompts
+    
+    @staticmethod
+    def build_classification_instructions(items: List[str], item_type: str = "проект") -> str:
         """
+        Строит статическую часть пользовательского промпта классификации (задача и формат ответа).
+        Зависит только от списка элементов, поэтому строится один раз на список.
         
-        # Пользовательский промпт
+        :param items: Список элементов для классификации
+        :param item_type: Тип элементов (проект, процесс и т.д.)
+        :return: Статическая часть пользовательского промпта
+        """
         example_item = items[0] if items else f"Пример {item_type}а"
         
-        user_prompt = f"""
-        Запрос пользователя: "{question}"
-        
-        Задача: определи, к какому {item_type} из списка наиболее релевантен этот запрос.
+        return f"""
+        Задача: определи, к какому {item_type} из списка наиболее релевантен запрос пользователя, приведенный в конце.
         
         Верни ответ в структурированном формате json. Например:
         
@@ -81,13 +89,94 @@ class PromptBuilder:
         ВАЖНО: Используй ТОЧНО такие же названия {item_type}ов как в предоставленном списке, ВКЛЮЧАЯ хештег-разделители (#название#)!
         Не добавляй и не убирай хештеги - они должны точно соответствовать списку элементов.
         """
+    
+    @staticmethod
+    def build_batch_classification_prompt(
+        questions: List[str],
+        items: List[str],
+        item_type: str = "проект",
+        system_prompt: str = None
+    ) -> Dict[str, str]:
+        """
+        Строит промпты для классификации нескольких запросов одним обращением к LLM.
+        Системный промпт тот же, что и для одиночной классификации.
         
-        prompts = {
+        :param questions: Список вопросов пользователей
+        :param items: Список элементов для классификации
+        :param item_type: Тип элементов (проект, процесс и т.д.)
+        :param system_prompt: Готовый системный промпт для этих items (если уже построен)
+        :return: Словарь с ключами 'system' и 'user' для промптов
+        """
+        if system_prompt is None:
+            system_prompt = PromptBuilder.build_classification_system_prompt(items, item_type)
+        
+        numbered_questions = "\n".join(f'{i}. "{question}"' for i, question in enumerate(questions, 1))
+        example_item = items[0] if items else f"#Пример {item_type}а#"
+        
+        # Запросы идут последними, чтобы статическая часть промпта оставалась общим префиксом
+        user_prompt = f"""
+        Задача: для КАЖДОГО запроса из списка, приведенного в конце, независимо определи,
+        к какому {item_type} из списка он наиболее релевантен.
+        
+        Верни ответ в структурированном формате json: по одному элементу results на каждый запрос,
+        question_index - номер запроса в списке запросов. Например:
+        
+        ```json
+        {{
+            "results": [
+                {{
+                    "question_index": 1,
+                    "reasoning": "Исходя из запроса я считаю что ... <ваши рассуждения>",
+                    "top_matches": [{{"item": "{example_item}", "score": 0.9}}]
+                }}
+            ]
+        }}
+        ```
+        
+        ВАЖНО: Используй ТОЧНО такие же названия {item_type}ов как в предоставленном списке, ВКЛЮЧАЯ хештег-разделители (#название#)!
+        Не пропускай запросы: количество элементов results должно быть равно {len(questions)}.
+        
+        Запросы пользователей:
+        {numbered_questions}
+        """
+        
+        return {
             'system': system_prompt,
             'user': user_prompt
         }
+    
+    @staticmethod
+    def build_classification_system_prompt(items: List[str], item_type: str = "проект") -> str:
+        """
+        Строит системный промпт классификации. Зависит только от списка элементов и их типа,
+        поэтому его можно построить один раз и переиспользовать для разных вопросов.
         
-        return prompts
+        :param items: Список элементов для классификации
+        :param item_type: Тип элементов (проект, процесс и т.д.)
+        :return: Системный промпт
+        """
+        system_prompt = f"""Ты эксперт по классификации запросов.
+        
+        Твоя задача: определить, к какому {item_type} из предоставленного списка наиболее релевантен запрос пользователя.
+        
+        Список возможных {item_type}ов:
+        <start_enums> {', '.join(items)} </finish_enums>
+        
+        ВАЖНАЯ ИНФОРМАЦИЯ О ХЕШТЕГ-РАЗДЕЛИТЕЛЯХ:
+        - Каждый элемент в списке обрамлен символами # (например: #Название проекта#)
+        - Хештеги служат разделителями сущностей для точной идентификации
+        - При выборе элемента ОБЯЗАТЕЛЬНО сохраняй хештеги в точности как показано в списке
+        - Хештеги помогают избежать путаницы между похожими названиями
+        
+        Проанализируй запрос и выполни следующие действия:
+        1. Проведи краткое рассуждение о том, к каким {item_type}ам может относиться запрос
+        2. Определи топ-3 наиболее релевантных {item_type}а и дай им оценки от 0 до 1
+        
+        Важно: выбирай только из предоставленного списка {item_type}ов, не добавляй свои варианты.
+        КРИТИЧЕСКИ ВАЖНО: Используй ТОЧНО такие же названия как в списке, ВКЛЮЧАЯ хештег-разделители (#название#)!
+        """
+        
+        return system_prompt
     
     @staticmethod
     def build_answer_prompt(
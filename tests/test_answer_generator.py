@@ -0,0 +1,33 @@
+# tests/test_answer_generator.py
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from app.domain.models.process import Process
+from app.services.process_answer_generator import ProcessAnswerGeneratorService
+
+
+def _processes():
+    return [Process(id="1", name="Закупка", description="Оформление закупки")]
+
+
+def test_make_md_falls_back_when_llm_returns_no_content():
+    llm_client = MagicMock()
+    llm_client.generate_completion.return_value = None
+    generator = ProcessAnswerGeneratorService(llm_client)
+
+    answer = generator.make_md("как оформить закупку", _processes())
+
+    assert answer.text == generator._generate_fallback_text("как оформить закупку", _processes())
+    assert answer.total_found == 1
+
+
+def test_make_md_async_falls_back_when_llm_returns_no_content():
+    llm_client = MagicMock()
+    llm_client.agenerate_completion = AsyncMock(return_value=None)
+    generator = ProcessAnswerGeneratorService(llm_client)
+
+    answer = asyncio.run(generator.make_md_async("как оформить закупку", _processes()))
+
+    assert isinstance(answer.text, str)
+    assert "Закупка" in answer.text
@@ -0,0 +1,53 @@
+# tests/test_classification_cache.py
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from app.services import classification_cache as classification_cache_module
+from app.services.classification_cache import ClassificationCache
+from app.services.process_classifier import ProcessClassifierService
+
+
+def test_normalize_ignores_case_spaces_quotes_yo_and_trailing_punctuation():
+    assert ClassificationCache.normalize("  Какие «Риски»  у   ЁЛКИ?! ") == 'какие "риски" у елки'
+    assert ClassificationCache.normalize("Проект — Альфа...") == ClassificationCache.normalize("проект - альфа")
+
+
+def test_get_returns_value_stored_for_normalized_question():
+    cache = ClassificationCache(max_size=4)
+    cache.set("Какие риски?", "items", "Альфа")
+
+    assert cache.get("какие   РИСКИ", "items") == "Альфа"
+    assert cache.get("какие риски", "other-items") is None
+
+
+def test_entry_expires_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(classification_cache_module.time, "monotonic", lambda: now[0])
+    cache = ClassificationCache(max_size=4, ttl_seconds=60)
+    cache.set("вопрос", "items", "Альфа")
+
+    now[0] += 59
+    assert cache.get("вопрос", "items") == "Альфа"
+
+    now[0] += 2
+    assert cache.get("вопрос", "items") is None
+    assert cache.misses == 1
+
+
+def test_alternating_item_lists_keep_cached_results():
+    classifier = ProcessClassifierService(MagicMock())
+    column = classifier.get_column_name()
+    first = pd.DataFrame({column: ["Закупка", "Поставка"]})
+    second = pd.DataFrame({column: ["Найм", "Увольнение"]})
+
+    classifier.load_items(first)
+    classifier._store_classification("как оформить закупку", "Закупка")
+    classifier.load_items(second)
+    classifier._store_classification("как оформить закупку", "Найм")
+
+    classifier.load_items(first)
+    assert classifier._get_cached_classification("как оформить закупку") == "Закупка"
+    classifier.load_items(second)
+    assert classifier._get_cached_classification("как оформить закупку") == "Найм"
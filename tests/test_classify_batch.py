@@ -0,0 +1,58 @@
+# tests/test_classify_batch.py
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from app.services.process_classifier import ProcessClassifierService
+
+
+def _classifier():
+    classifier = ProcessClassifierService(MagicMock())
+    classifier.load_items(pd.DataFrame({classifier.get_column_name(): ["Закупка", "Поставка", "Найм"]}))
+    return classifier
+
+
+def _entry(question_index, item):
+    return {
+        "question_index": question_index,
+        "reasoning": "",
+        "top_matches": [{"item": f"#{item}#", "score": 0.9}],
+    }
+
+
+def test_classify_batch_maps_results_by_question_index():
+    classifier = _classifier()
+    classifier._store_classification("вопрос из кэша", "Поставка")
+    batch_model = classifier._create_dynamic_batch_classification_model(classifier.items_list)
+    # Ответ модели: номера вопросов не по порядку, третьего вопроса пачки нет
+    classifier.llm_client.generate_structured_completion.return_value = batch_model.model_validate(
+        {"results": [_entry(2, "Поставка"), _entry(1, "Закупка")]}
+    )
+
+    results = classifier.classify_batch([
+        "как оформить договор",
+        "что с процессом Найм",
+        "вопрос из кэша",
+        "сроки доставки",
+        "непонятный вопрос",
+    ])
+
+    assert results == ["Закупка", "Найм", "Поставка", "Поставка", ""]
+    # Вопросы с очевидным или закэшированным ответом в LLM не отправляются
+    classifier.llm_client.generate_structured_completion.assert_called_once()
+    user_prompt = classifier.llm_client.generate_structured_completion.call_args.kwargs["user_prompt"]
+    assert "как оформить договор" in user_prompt
+    assert "что с процессом Найм" not in user_prompt
+    assert "вопрос из кэша" not in user_prompt
+    # Вопрос без результата в ответе не кэшируется
+    assert classifier._get_cached_classification("непонятный вопрос") is None
+    assert classifier._get_cached_classification("сроки доставки") == "Поставка"
+
+
+def test_classify_batch_skips_llm_when_all_questions_are_resolved():
+    classifier = _classifier()
+    classifier._store_classification("вопрос из кэша", "Закупка")
+
+    assert classifier.classify_batch(["про Найм", "вопрос из кэша"]) == ["Найм", "Закупка"]
+    classifier.llm_client.generate_structured_completion.assert_not_called()
@@ -0,0 +1,39 @@
+# tests/test_keyword_search_tool.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.tools.implementations._shared.keyword_search_tool import KeywordSearchTool
+
+
+def _expected_positions(relevance: np.ndarray, top_n: int) -> list:
+    """Прежний порядок: стабильная сортировка ненулевых оценок по убыванию."""
+    scores = pd.Series(relevance)
+    matched = scores[scores > 0]
+    return matched.sort_values(ascending=False, kind="stable").index[:top_n].tolist()
+
+
+@pytest.mark.parametrize("top_n", [1, 2, 3, 4, 6, 10])
+def test_top_positions_matches_stable_sort_with_ties(top_n):
+    relevance = np.array([0.5, 1.0, 0.0, 0.5, 1.0, 0.5, 0.25, 0.0])
+    positions = np.flatnonzero(relevance > 0)
+
+    result = KeywordSearchTool._top_positions(relevance, positions, top_n)
+
+    assert result.tolist() == _expected_positions(relevance, top_n)
+
+
+def test_top_positions_on_integer_hit_counts():
+    hits = np.array([2, 0, 3, 2, 3, 1], dtype=np.int8)
+    positions = np.flatnonzero(hits)
+
+    assert KeywordSearchTool._top_positions(hits, positions, 3).tolist() == [2, 4, 0]
+
+
+def test_top_positions_with_top_n_not_less_than_matches():
+    relevance = np.array([0.2, 0.2, 0.0, 0.6])
+    positions = np.flatnonzero(relevance > 0)
+
+    assert KeywordSearchTool._top_positions(relevance, positions, len(relevance)).tolist() == [3, 0, 1]
+    assert KeywordSearchTool._top_positions(relevance, positions, 0).tolist() == []
@@ -0,0 +1,118 @@
+# tests/test_llm_cache.py
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import BaseModel
+
+from app.adapters import llm_client as llm_client_module
+from app.adapters.llm_cache import LLMResponseCache
+from app.adapters.llm_client import LLMClient
+from app.config import llm_settings
+
+
+class Answer(BaseModel):
+    item: str
+    score: float
+
+
+class RenamedAnswer(BaseModel):
+    item: str
+    score: float
+
+
+def _text_completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def _parsed_completion(parsed):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))])
+
+
+@pytest.fixture
+def make_client(monkeypatch, tmp_path):
+    """Создает LLMClient с постоянным кэшем во временном каталоге и замоканным OpenAI-клиентом."""
+    monkeypatch.setattr(llm_settings, "cache_enabled", True)
+    monkeypatch.setattr(llm_settings, "deterministic_cache_enabled", True)
+    monkeypatch.setattr(llm_settings, "deterministic_cache_dir", str(tmp_path / "llm_det"))
+
+    def factory():
+        client = LLMClient()
+        client.client = MagicMock()
+        return client
+    return factory
+
+
+def test_deterministic_cache_round_trip_through_sqlite(make_client, monkeypatch):
+    validated = []
+    original_get_type_adapter = llm_client_module.get_type_adapter
+
+    def spy_get_type_adapter(model):
+        validated.append(model)
+        return original_get_type_adapter(model)
+    monkeypatch.setattr(llm_client_module, "get_type_adapter", spy_get_type_adapter)
+
+    first = make_client()
+    first.client.beta.chat.completions.parse.return_value = _parsed_completion(Answer(item="Альфа", score=0.9))
+
+    # Промах: ответ получен от LLM и сохранен в память и SQLite
+    assert first.generate_structured_completion("system", "user", Answer) == Answer(item="Альфа", score=0.9)
+    # Попадание в память: повторного запроса к LLM нет
+    assert first.generate_structured_completion("system", "user", Answer) == Answer(item="Альфа", score=0.9)
+    assert first.client.beta.chat.completions.parse.call_count == 1
+    assert first.cache.hits == 1
+    assert validated == []
+
+    # Новый клиент (как после перезапуска): память пуста, ответ восстанавливается из SQLite
+    second = make_client()
+    restored = second.generate_structured_completion("system", "user", Answer)
+
+    assert isinstance(restored, Answer)
+    assert restored == Answer(item="Альфа", score=0.9)
+    second.client.beta.chat.completions.parse.assert_not_called()
+    assert second.deterministic_cache.hits == 1
+    assert validated == [Answer]
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = LLMResponseCache(max_size=2)
+    cache.set("a", "ответ a")
+    cache.set("b", "ответ b")
+    assert cache.get("a") == "ответ a"
+
+    cache.set("c", "ответ c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "ответ a"
+    assert cache.get("c") == "ответ c"
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_bypass_cache_neither_reads_nor_stores(make_client):
+    client = make_client()
+    client.client.chat.completions.create.side_effect = [_text_completion("первый"), _text_completion("второй")]
+
+    assert client.generate_completion("system", "user", bypass_cache=True) == "первый"
+    assert client.generate_completion("system", "user", bypass_cache=True) == "второй"
+
+    assert client.client.chat.completions.create.call_count == 2
+    assert client.cache.get(client._cache_key("system", "user", 0.0)) is None
+    assert client.deterministic_cache.get(client._cache_key("system", "user", 0.0)) is None
+
+
+def test_structured_cache_key_includes_response_model_name(make_client):
+    client = make_client()
+    client.client.beta.chat.completions.parse.side_effect = [
+        _parsed_completion(Answer(item="Альфа", score=0.9)),
+        _parsed_completion(RenamedAnswer(item="Бета", score=0.5)),
+    ]
+
+    first = client.generate_structured_completion("system", "user", Answer)
+    second = client.generate_structured_completion("system", "user", RenamedAnswer)
+
+    # Одинаковые промпты, но разные модели ответа - второй запрос не должен получить чужой ответ из кэша
+    assert client.client.beta.chat.completions.parse.call_count == 2
+    assert isinstance(first, Answer)
+    assert isinstance(second, RenamedAnswer)
+    assert client.generate_structured_completion("system", "user", Answer) is first